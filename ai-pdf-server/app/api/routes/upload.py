@@ -26,6 +26,9 @@ from app.utils.helpers import get_logger, get_utc_timestamp
 
 logger = get_logger(__name__)
 
+# Block size used when hashing uploads without buffering them
+UPLOAD_READ_CHUNK_SIZE = 1 << 20
+
 router = APIRouter(tags=["Documents"])
 
 
@@ -241,9 +244,9 @@ async def list_documents(request: Request):
             except Exception:
                 pass
             try:
-                ts = datetime.fromisoformat(created_at.replace("Z", "+00:00")) if created_at else datetime.utcnow()
+                ts = datetime.fromisoformat(created_at.replace("Z", "+00:00")) if created_at else get_utc_timestamp()
             except Exception:
-                ts = datetime.utcnow()
+                ts = get_utc_timestamp()
             doc = DocumentMetadata(
                 document_id=doc_id,
                 filename=filename,
@@ -389,6 +392,44 @@ async def verify_document_integrity(request: IntegrityVerifyRequest):
     )
 
 
+@router.post(
+    "/documents/{document_id}/verify-file",
+    response_model=IntegrityVerifyResponse,
+    summary="Verify document integrity from a file",
+    description="Verify a document's integrity by hashing an uploaded copy and comparing with the stored hash.",
+)
+async def verify_document_file(document_id: str, file: UploadFile = File(...)):
+    """
+    Verify document integrity from the file itself.
+
+    The upload is hashed in 1 MB blocks as it is read, so the
+    file is never held in memory as a whole.
+    """
+
+    async def read_blocks():
+        while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+            yield chunk
+
+    is_valid, stored_hash, computed_hash, message = await integrity_service.verify_stream_integrity(
+        document_id=document_id,
+        reader=read_blocks(),
+    )
+
+    if not stored_hash:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document not found: {document_id}",
+        )
+
+    return IntegrityVerifyResponse(
+        document_id=document_id,
+        is_valid=is_valid,
+        stored_hash=stored_hash,
+        provided_hash=computed_hash,
+        message=message,
+    )
+
+
 @router.delete(
     "/documents/{document_id}",
     response_model=DeleteResponse,
@@ -10,7 +10,7 @@ from fastapi.responses import Response, StreamingResponse
 from app.models.schemas import RAGResponse
 from app.services.teacher_service import teacher_service
 from app.services.vector_service import vector_store
-from app.services.voice_service import voice_service
+from app.services.voice_service import SpeechResult, voice_service
 from app.utils.helpers import get_logger
 
 logger = get_logger(__name__)
@@ -203,16 +203,21 @@ async def transcribe_audio(
     Supported formats: mp3, wav, webm, m4a, ogg
     """
     try:
-        audio_data = await audio.read()
+        # size is None when the multipart part carried no length; peek instead
+        empty = not audio.size
+        if audio.size is None:
+            empty = not await audio.read(1)
+            await audio.seek(0)
 
-        if len(audio_data) == 0:
+        if empty:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Empty audio file",
             )
 
+        # Hand the spooled upload to the SDK without copying it into memory
         result = await voice_service.transcribe_audio(
-            audio_data=audio_data,
+            audio_data=audio.file,
             language=language,
         )
 
@@ -221,6 +226,8 @@ async def transcribe_audio(
             "language": result.language,
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Transcription failed", error=str(e))
         raise HTTPException(
@@ -346,6 +353,31 @@ async def voice_health():
 # ============================================================
 
 
+async def _send_answer(
+    websocket: WebSocket,
+    response: RAGResponse,
+    speech: SpeechResult,
+    binary_audio: bool,
+) -> None:
+    """Send an answer message, with audio inline as base64 or as a following binary frame."""
+    message = {
+        "type": "answer",
+        "text": response.answer,
+        "audio_format": speech.format,
+        "sources": [s.model_dump() for s in response.sources],
+        "confidence": response.confidence,
+    }
+
+    if not binary_audio:
+        message["audio"] = voice_service.audio_to_base64(speech.audio_data)
+        await websocket.send_json(message)
+        return
+
+    message["audio_bytes"] = len(speech.audio_data)
+    await websocket.send_json(message)
+    await websocket.send_bytes(speech.audio_data)
+
+
 @router.websocket("/ws/voice/{document_id}")
 async def websocket_voice_chat(websocket: WebSocket, document_id: str):
     """
@@ -353,9 +385,14 @@ async def websocket_voice_chat(websocket: WebSocket, document_id: str):
     
     Protocol:
     1. Client sends: {"type": "audio", "data": "<base64_audio>"}
+       Or: a binary frame with the raw audio bytes
        Or: {"type": "text", "question": "your question"}
     2. Server sends: {"type": "transcription", "text": "..."}
     3. Server sends: {"type": "answer", "text": "...", "audio": "<base64>"}
+
+    Sending {"type": "config", "binary_audio": true} switches answers to
+    {"type": "answer", ..., "audio_bytes": <size>} followed by a binary
+    frame with the raw audio, skipping base64 in both directions.
     
     For streaming:
     1. Server sends: {"type": "audio_chunk", "data": "<base64_chunk>"}
@@ -380,20 +417,28 @@ async def websocket_voice_chat(websocket: WebSocket, document_id: str):
 
     student_name = None
     voice = voice_service.DEFAULT_TEACHER_VOICE
+    binary_audio = False
 
     try:
         while True:
             # Receive message
-            data = await websocket.receive_text()
-            
-            try:
-                message = json.loads(data)
-            except json.JSONDecodeError:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Invalid JSON format",
-                })
-                continue
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+
+            # Binary frames carry raw audio, no base64 wrapper
+            raw_audio = frame.get("bytes")
+            if raw_audio is not None:
+                message = {"type": "audio"}
+            else:
+                try:
+                    message = json.loads(frame.get("text") or "")
+                except json.JSONDecodeError:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": "Invalid JSON format",
+                    })
+                    continue
 
             msg_type = message.get("type", "")
 
@@ -401,17 +446,19 @@ async def websocket_voice_chat(websocket: WebSocket, document_id: str):
             if msg_type == "config":
                 student_name = message.get("student_name")
                 voice = message.get("voice", voice)
+                binary_audio = bool(message.get("binary_audio", binary_audio))
                 await websocket.send_json({
                     "type": "config_updated",
                     "student_name": student_name,
                     "voice": voice,
+                    "binary_audio": binary_audio,
                 })
                 continue
 
             # Handle audio input
             if msg_type == "audio":
                 audio_base64 = message.get("data", "")
-                if not audio_base64:
+                if not raw_audio and not audio_base64:
                     await websocket.send_json({
                         "type": "error",
                         "message": "Audio data required",
@@ -420,7 +467,7 @@ async def websocket_voice_chat(websocket: WebSocket, document_id: str):
 
                 try:
                     # Decode audio
-                    audio_data = base64.b64decode(audio_base64)
+                    audio_data = raw_audio or base64.b64decode(audio_base64)
 
                     # Send processing status
                     await websocket.send_json({
@@ -451,14 +498,7 @@ async def websocket_voice_chat(websocket: WebSocket, document_id: str):
                     )
 
                     # Send complete response
-                    await websocket.send_json({
-                        "type": "answer",
-                        "text": response.answer,
-                        "audio": voice_service.audio_to_base64(speech.audio_data),
-                        "audio_format": speech.format,
-                        "sources": [s.model_dump() for s in response.sources],
-                        "confidence": response.confidence,
-                    })
+                    await _send_answer(websocket, response, speech, binary_audio)
 
                 except Exception as e:
                     logger.error("Voice processing error", error=str(e))
@@ -498,14 +538,7 @@ async def websocket_voice_chat(websocket: WebSocket, document_id: str):
                     )
 
                     # Send response
-                    await websocket.send_json({
-                        "type": "answer",
-                        "text": response.answer,
-                        "audio": voice_service.audio_to_base64(speech.audio_data),
-                        "audio_format": speech.format,
-                        "sources": [s.model_dump() for s in response.sources],
-                        "confidence": response.confidence,
-                    })
+                    await _send_answer(websocket, response, speech, binary_audio)
 
                 except Exception as e:
                     logger.error("Text processing error", error=str(e))
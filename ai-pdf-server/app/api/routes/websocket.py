@@ -4,7 +4,7 @@ import asyncio
 import json
 import base64
 import uuid
-from typing import Dict, Set, Optional
+from typing import Dict, Set, Optional, Tuple
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status, Header
 
@@ -26,6 +26,26 @@ logger = get_logger(__name__)
 
 router = APIRouter(tags=["WebSocket"])
 
+# Binary client frames on the voice WebSockets: the first byte is the
+# message type, the rest is its payload (raw PCM16 for audio_chunk).
+# Control messages stay JSON text frames.
+VOICE_FRAME_AUDIO_CHUNK = 0x01
+VOICE_FRAME_INTERRUPT = 0x02
+
+_VOICE_FRAME_TYPES = {
+    VOICE_FRAME_AUDIO_CHUNK: "audio_chunk",
+    VOICE_FRAME_INTERRUPT: "interrupt",
+}
+
+
+def _parse_voice_frame(frame: bytes) -> Tuple[dict, bytes]:
+    """Split a binary voice frame into a message dict and its raw payload."""
+    if not frame:
+        return {"type": ""}, b""
+    opcode = frame[0]
+    msg_type = _VOICE_FRAME_TYPES.get(opcode, f"0x{opcode:02x}")
+    return {"type": msg_type}, frame[1:]
+
 
 class ConnectionManager:
     """
@@ -277,8 +297,11 @@ async def websocket_voice_realtime(websocket: WebSocket, document_id: str):
     Protocol:
     Client → Server:
     - {"type": "audio_chunk", "data": "<base64_audio>"}  # Audio data during speech
+      Or: a binary frame, 0x01 followed by the raw audio bytes
+    - {"type": "config", "binary_audio": true}            # AI audio as binary frames
     - {"type": "end_speech"}                              # User finished speaking
     - {"type": "interrupt"}                               # Explicitly interrupt AI
+      Or: a binary frame with the single byte 0x02
     - {"type": "ping"}                                    # Keep-alive ping
 
     Server → Client:
@@ -286,6 +309,7 @@ async def websocket_voice_realtime(websocket: WebSocket, document_id: str):
     - {"type": "transcription", "text": "..."}           # User speech transcribed
     - {"type": "text_response", "text": "..."}           # AI text response
     - {"type": "audio_chunk", "data": "<base64_audio>"}  # AI audio response chunk
+      Or, with binary_audio: a binary frame with the raw audio bytes
     - {"type": "audio_end"}                              # AI audio finished
     - {"type": "error", "message": "..."}                # Error occurred
     - {"type": "pong"}                                   # Keep-alive response
@@ -374,18 +398,28 @@ async def websocket_voice_realtime(websocket: WebSocket, document_id: str):
         "message": "Connected. Start speaking."
     })
 
+    binary_audio = False
+
     try:
         while True:
-            data = await websocket.receive_text()
-
-            try:
-                message = json.loads(data)
-            except json.JSONDecodeError:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Invalid JSON format"
-                })
-                continue
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+
+            # Binary frames carry an opcode byte and raw audio, no base64
+            audio_bytes = None
+            raw = frame.get("bytes")
+            if raw is not None:
+                message, audio_bytes = _parse_voice_frame(raw)
+            else:
+                try:
+                    message = json.loads(frame.get("text") or "")
+                except json.JSONDecodeError:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": "Invalid JSON format"
+                    })
+                    continue
 
             msg_type = message.get("type", "")
 
@@ -393,12 +427,20 @@ async def websocket_voice_realtime(websocket: WebSocket, document_id: str):
                 # Keep-alive
                 await websocket.send_json({"type": "pong"})
 
+            elif msg_type == "config":
+                binary_audio = bool(message.get("binary_audio", binary_audio))
+                await websocket.send_json({
+                    "type": "config_updated",
+                    "binary_audio": binary_audio
+                })
+
             elif msg_type == "audio_chunk":
                 # Decode and handle audio
                 audio_b64 = message.get("data", "")
-                if audio_b64:
+                if audio_bytes or audio_b64:
                     try:
-                        audio_bytes = base64.b64decode(audio_b64)
+                        if audio_bytes is None:
+                            audio_bytes = base64.b64decode(audio_b64)
                         await realtime_voice_service.handle_audio_chunk(
                             session=session,
                             audio_data=audio_bytes,
@@ -417,6 +459,9 @@ async def websocket_voice_realtime(websocket: WebSocket, document_id: str):
                         on_text_response=on_text_response
                     ):
                         # Stream audio to client
+                        if binary_audio:
+                            await websocket.send_bytes(audio_chunk)
+                            continue
                         audio_b64 = base64.b64encode(audio_chunk).decode('utf-8')
                         await websocket.send_json({
                             "type": "audio_chunk",
@@ -474,8 +519,11 @@ async def websocket_voice_call(
     Protocol:
     Client → Server:
     - {"type": "start_call"}                              # Initialize the call
+    - {"type": "start_call", "binary_audio": true}        # ...with AI audio as binary frames
     - {"type": "audio_chunk", "data": "<base64_pcm16>"}   # Audio data (PCM16, 24kHz, mono)
+      Or: a binary frame, 0x01 followed by the raw PCM16 bytes
     - {"type": "interrupt"}                               # Interrupt AI response
+      Or: a binary frame with the single byte 0x02
     - {"type": "mute"}                                    # Mute microphone
     - {"type": "unmute"}                                  # Unmute microphone
     - {"type": "end_call"}                                # End the call
@@ -486,6 +534,7 @@ async def websocket_voice_call(
     - {"type": "state_change", "state": "<state>"}
     - {"type": "transcription", "role": "user|assistant", "text": "..."}
     - {"type": "audio_chunk", "data": "<base64_pcm16>"}
+      Or, with binary_audio: a binary frame with the raw PCM16 bytes
     - {"type": "audio_end"}
     - {"type": "call_ended", "duration_seconds": ..., "questions_asked": ...}
     - {"type": "fallback_activated", "reason": "..."}
@@ -534,7 +583,9 @@ async def websocket_voice_call(
     # Previously each callback spawned an independent asyncio.create_task,
     # leading to race conditions where hundreds of concurrent tasks fought
     # to write to the same WebSocket.
+    # Holds JSON messages, or raw bytes for binary audio frames.
     send_queue: asyncio.Queue = asyncio.Queue()
+    binary_audio = False
 
     async def _send_worker():
         """Drain send_queue and write messages to the client in strict order."""
@@ -544,7 +595,10 @@ async def websocket_voice_call(
                 if msg is None:  # Sentinel: shut down
                     break
                 try:
-                    await websocket.send_json(msg)
+                    if isinstance(msg, bytes):
+                        await websocket.send_bytes(msg)
+                    else:
+                        await websocket.send_json(msg)
                 except Exception as e:
                     logger.error(f"Failed to send queued message: {e}")
                     break
@@ -562,6 +616,9 @@ async def websocket_voice_call(
 
     def sync_on_audio(audio_bytes):
         try:
+            if binary_audio:
+                send_queue.put_nowait(audio_bytes)
+                return
             audio_b64 = base64.b64encode(audio_bytes).decode('utf-8')
             send_queue.put_nowait({"type": "audio_chunk", "data": audio_b64})
         except Exception:
@@ -599,20 +656,29 @@ async def websocket_voice_call(
     
     try:
         while True:
-            data = await websocket.receive_text()
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
             # Use debug for high-frequency audio messages to avoid log I/O bottleneck
             logger.debug("Received WebSocket message", session_id=session_id)
             
-            try:
-                message = json.loads(data)
-            except json.JSONDecodeError:
-                logger.warning(f"Invalid JSON received: {data[:100]}", session_id=session_id)
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Invalid JSON format",
-                    "code": "invalid_json"
-                })
-                continue
+            # Binary frames carry an opcode byte and raw PCM16, no base64
+            audio_bytes = None
+            raw = frame.get("bytes")
+            if raw is not None:
+                message, audio_bytes = _parse_voice_frame(raw)
+            else:
+                data = frame.get("text") or ""
+                try:
+                    message = json.loads(data)
+                except json.JSONDecodeError:
+                    logger.warning(f"Invalid JSON received: {data[:100]}", session_id=session_id)
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": "Invalid JSON format",
+                        "code": "invalid_json"
+                    })
+                    continue
             
             msg_type = message.get("type", "")
             # Use debug for high-frequency audio_chunk messages
@@ -624,6 +690,7 @@ async def websocket_voice_call(
             
             elif msg_type == "start_call":
                 logger.info("Processing start_call request", session_id=session_id, user_id=user_id, document_id=document_id)
+                binary_audio = bool(message.get("binary_audio", False))
                 # Initialize the call
                 try:
                     # Create call session with ownership validation (use same session_id as WebSocket)
@@ -657,6 +724,7 @@ async def websocket_voice_call(
                         "session_id": session_id,
                         "greeting": greeting,
                         "voice_mode": call_session.voice_mode.value,
+                        "binary_audio": binary_audio,
                     })
                     
                     logger.info(f"Voice call started: {session_id}")
@@ -709,9 +777,10 @@ async def websocket_voice_call(
                     continue
                 
                 audio_b64 = message.get("data", "")
-                if audio_b64:
+                if audio_bytes or audio_b64:
                     try:
-                        audio_bytes = base64.b64decode(audio_b64)
+                        if audio_bytes is None:
+                            audio_bytes = base64.b64decode(audio_b64)
                         
                         # Rate limit check
                         if call_session and not call_session_manager.check_rate_limit(
@@ -36,12 +36,14 @@ class Settings:
         self.EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
         self.LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4o")
         self.EMBEDDING_DIMENSIONS: int = 1536
+        self.OPENAI_AUDIO_RPM: int = int(os.getenv("OPENAI_AUDIO_RPM", "500"))
 
         # RAG settings
         self.CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "500"))
         self.CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "50"))
         self.TOP_K_RESULTS: int = int(os.getenv("TOP_K_RESULTS", "5"))
         self.CONFIDENCE_THRESHOLD: float = float(os.getenv("CONFIDENCE_THRESHOLD", "0.7"))
+        self.MAX_CACHED_INDICES: int = int(os.getenv("MAX_CACHED_INDICES", "64"))
 
         # Voice call session settings
         self.VOICE_SESSION_TIMEOUT_MINUTES: int = int(os.getenv("VOICE_SESSION_TIMEOUT_MINUTES", "5"))
@@ -89,6 +91,9 @@ class Settings:
         self.INDEX_DIR: Path = INDEX_DIR
         self.METADATA_DIR: Path = METADATA_DIR
 
+        # Use kernel async file I/O (aiofile/caio) instead of aiofiles' thread pool
+        self.ENABLE_NATIVE_AIO: bool = os.getenv("ENABLE_NATIVE_AIO", "false").lower() == "true"
+
         # Logging
         self.LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
         self.LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
@@ -7,11 +7,12 @@ The hash storage is designed to be easily migrated to blockchain storage.
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, Optional
 
 from app.core.config import settings
 from app.utils.helpers import (
     compute_sha256,
+    compute_sha256_stream,
     get_logger,
     load_json_async,
     read_file_async,
@@ -225,6 +226,25 @@ class IntegrityService:
         computed_hash = compute_sha256(file_bytes)
         return await self.verify_integrity(document_id, computed_hash)
 
+    async def verify_stream_integrity(
+        self,
+        document_id: str,
+        reader: AsyncIterator[bytes],
+    ) -> tuple[bool, str, str, str]:
+        """
+        Verify a streamed file against stored hash without buffering it.
+
+        Args:
+            document_id: Document ID
+            reader: Async iterator of file content chunks
+
+        Returns:
+            Tuple of (is_valid, stored_hash, computed_hash, message)
+        """
+        computed_hash = await compute_sha256_stream(reader)
+        is_valid, stored_hash, message = await self.verify_integrity(document_id, computed_hash)
+        return is_valid, stored_hash, computed_hash, message
+
     async def delete_record(self, document_id: str) -> bool:
         """
         Delete a hash record.
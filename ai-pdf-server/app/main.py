@@ -1,7 +1,6 @@
 """FastAPI application factory and configuration."""
 
 from contextlib import asynccontextmanager
-from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,7 +10,8 @@ from app.api.routes import chat, upload, voice, websocket, extraction, verificat
 from app.core.config import settings
 from app.models.schemas import ErrorResponse, HealthCheckResponse
 from app.services.vector_service import vector_store
-from app.utils.helpers import get_logger, setup_logging
+from app.services.voice_service import voice_service
+from app.utils.helpers import get_logger, get_utc_timestamp, setup_logging
 
 # Initialize logging
 setup_logging()
@@ -53,6 +53,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down AI PDF Server")
+    await voice_service.aclose()
 
 
 # Create FastAPI application
@@ -184,7 +185,7 @@ async def health_check():
     return HealthCheckResponse(
         status="healthy",
         version="1.0.0",
-        timestamp=datetime.utcnow(),
+        timestamp=get_utc_timestamp(),
     )
 
 
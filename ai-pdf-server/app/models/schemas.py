@@ -1,6 +1,6 @@
 """Pydantic schemas for request/response models."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import List, Optional
 
@@ -52,7 +52,7 @@ class DocumentMetadata(BaseModel):
     document_id: str = Field(..., description="Unique document identifier")
     filename: str = Field(..., description="Original filename")
     upload_timestamp: datetime = Field(
-        default_factory=datetime.utcnow, description="When document was uploaded"
+        default_factory=lambda: datetime.now(timezone.utc), description="When document was uploaded"
     )
     sha256_hash: str = Field(..., description="SHA-256 hash of document content")
     page_count: int = Field(..., description="Number of pages in document")
@@ -229,5 +229,5 @@ class HealthCheckResponse(BaseModel):
     status: str = Field(default="healthy", description="Service status")
     version: str = Field(default="1.0.0", description="API version")
     timestamp: datetime = Field(
-        default_factory=datetime.utcnow, description="Current timestamp"
+        default_factory=lambda: datetime.now(timezone.utc), description="Current timestamp"
     )
@@ -11,9 +11,9 @@ import fitz  # PyMuPDF
 from app.core.config import settings
 from app.models.schemas import TextChunk
 from app.utils.helpers import (
+    chunk_id_factory,
     clean_text,
     compute_sha256,
-    generate_chunk_id,
     generate_document_id,
     get_logger,
     save_file_async,
@@ -222,6 +222,7 @@ class PDFService:
 
             text = page.text
             start = 0
+            make_chunk_id = chunk_id_factory(document_id, page.page_number)
 
             while start < len(text):
                 # Calculate end position
@@ -239,7 +240,7 @@ class PDFService:
                 chunk_text = text[start:end].strip()
 
                 if chunk_text:
-                    chunk_id = generate_chunk_id(document_id, page.page_number, chunk_index)
+                    chunk_id = make_chunk_id(chunk_index)
 
                     chunks.append(
                         TextChunk(
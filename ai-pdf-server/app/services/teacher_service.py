@@ -1,8 +1,15 @@
 """AI Teacher service for educational voice interactions."""
 
+import hashlib
 import json
-from typing import AsyncGenerator, Optional
-
+import re
+import string
+import time
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import AsyncGenerator, Optional, Tuple
+
+import numpy as np
 from openai import AsyncOpenAI
 
 from app.core.config import settings
@@ -14,6 +21,34 @@ from app.utils.helpers import get_logger, truncate_text
 
 logger = get_logger(__name__)
 
+# Semantic answer cache settings
+ANSWER_CACHE_SIMILARITY = 0.92
+ANSWER_CACHE_TTL_SECONDS = 600
+ANSWER_CACHE_MAX_ENTRIES = 256
+ANSWER_CACHE_MAX_DOCUMENTS = 64
+
+# Exact-match question embedding cache size
+EMBEDDING_CACHE_MAX_ENTRIES = 2048
+
+FALLBACK_REASONING = "Fallback using vector search"
+
+# Streaming speech: split the answer at sentence ends once this many chars are buffered
+MIN_SPEECH_SEGMENT_CHARS = 40
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_ANSWER_FIELD_RE = re.compile(r'"answer"\s*:\s*"')
+
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+# Prompt context trimming: drop weak matches, cap chunk size, skip near-duplicates
+CONTEXT_MIN_SCORE = 0.2
+CONTEXT_CHUNK_MAX_CHARS = 800
+CONTEXT_DUPLICATE_RATIO = 0.9
+CONTEXT_DUPLICATE_MAX_CHARS = 256  # bounds the quadratic ratio() on the request path
+
+# LLM output JSON extraction
+_JSON_FENCE_RE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.DOTALL)
+
 
 # Teacher persona system prompt
 TEACHER_SYSTEM_PROMPT = """You are an expert AI teacher helping students learn from educational documents. Your role is to:
@@ -58,6 +93,142 @@ GREETING_RESPONSES = {
 }
 
 
+# Greeting openers mapped to their GREETING_RESPONSES key
+_GREETING_WORDS = {
+    "hello": "hello",
+    "hi": "hi",
+    "hey": "hey",
+    "greetings": "default",
+}
+_GREETING_PHRASES = {
+    "good morning": "default",
+    "good afternoon": "default",
+    "good evening": "default",
+    "help me": "help",
+}
+_GREETING_PUNCTUATION = ",.!?"
+
+
+class _AnswerFieldStream:
+    """
+    Incrementally extracts the "answer" string from streamed JSON output.
+
+    Feed raw LLM deltas in order; each call returns the newly decoded
+    answer text (JSON escapes resolved), or an empty string. Malformed
+    \\u escapes and unpaired surrogates decode to U+FFFD instead of raising.
+    """
+
+    _ESCAPES = {
+        '"': '"', "\\": "\\", "/": "/",
+        "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t",
+    }
+    _REPLACEMENT = "\ufffd"
+
+    def __init__(self):
+        self._buffer = ""
+        self._state = "seek"  # seek -> value -> done
+
+    @property
+    def found(self) -> bool:
+        """Whether the answer field has been located."""
+        return self._state != "seek"
+
+    def feed(self, delta: str) -> str:
+        """Consume a delta and return newly available answer text."""
+        if self._state == "done":
+            return ""
+
+        self._buffer += delta
+        if self._state == "seek":
+            match = _ANSWER_FIELD_RE.search(self._buffer)
+            if not match:
+                return ""
+            self._buffer = self._buffer[match.end():]
+            self._state = "value"
+
+        buf = self._buffer
+        out = []
+        i = 0
+        n = len(buf)
+        while i < n:
+            ch = buf[i]
+            if ch == '"':
+                self._state = "done"
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+
+            # Escape sequence; wait for more input if it is split across deltas
+            if i + 1 >= n:
+                break
+            esc = buf[i + 1]
+            if esc != "u":
+                out.append(self._ESCAPES.get(esc, esc))
+                i += 2
+                continue
+            decoded = self._decode_unicode_escape(buf, i)
+            if decoded is None:
+                break
+            text, consumed = decoded
+            out.append(text)
+            i += consumed
+
+        self._buffer = buf[i:]
+        return "".join(out)
+
+    @staticmethod
+    def _hex4(buf: str, start: int) -> Tuple[Optional[int], bool]:
+        """
+        Read the 4 hex digits at buf[start:start + 4].
+
+        Returns:
+            (code, complete): code is None if a non-hex character was seen;
+            complete is False when fewer than 4 valid digits are buffered yet
+        """
+        digits = buf[start:start + 4]
+        if not all(c in string.hexdigits for c in digits):
+            return None, True
+        if len(digits) < 4:
+            return None, False
+        return int(digits, 16), True
+
+    @classmethod
+    def _decode_unicode_escape(cls, buf: str, i: int) -> Optional[Tuple[str, int]]:
+        """
+        Decode the \\u escape starting at buf[i].
+
+        Returns:
+            (text, characters consumed), or None to wait for more input
+        """
+        code, complete = cls._hex4(buf, i + 2)
+        if not complete:
+            return None
+        if code is None:
+            # Drop only the "\u" so a following quote still ends the string
+            return cls._REPLACEMENT, 2
+        if 0xDC00 <= code <= 0xDFFF:
+            return cls._REPLACEMENT, 6
+        if not 0xD800 <= code <= 0xDBFF:
+            return chr(code), 6
+
+        # High surrogate: only valid when followed by a \uDC00-\uDFFF escape
+        marker = buf[i + 6:i + 8]
+        if marker != "\\u":
+            if len(marker) < 2 and "\\u".startswith(marker):
+                return None
+            return cls._REPLACEMENT, 6
+        low, complete = cls._hex4(buf, i + 8)
+        if not complete:
+            return None
+        if low is None or not 0xDC00 <= low <= 0xDFFF:
+            # Lone high surrogate; the next escape is decoded on its own
+            return cls._REPLACEMENT, 6
+        return chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)), 12
+
+
 class TeacherService:
     """
     AI Teacher service for educational voice-to-voice interactions.
@@ -71,6 +242,14 @@ class TeacherService:
         self.model = settings.LLM_MODEL
         self.top_k = settings.TOP_K_RESULTS
 
+        # Per-document semantic cache: question -> (unit embedding, response, stored_at)
+        self._answer_cache: OrderedDict[
+            str, OrderedDict[str, Tuple[np.ndarray, RAGResponse, float]]
+        ] = OrderedDict()
+
+        # sha1(normalized question) -> embedding
+        self._embedding_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+
     async def answer_student_question(
         self,
         document_id: str,
@@ -94,9 +273,44 @@ class TeacherService:
             question_length=len(question),
         )
 
+        immediate, question_embedding, search_results = await self._retrieve(
+            document_id, question, student_name
+        )
+        if immediate is not None:
+            return immediate
+
+        # Build context and generate teaching response
+        context = self._build_context(search_results)
+        response = await self._generate_teaching_response(
+            question, context, search_results, student_name
+        )
+
+        self._remember_answer(
+            document_id, question, question_embedding, response, student_name
+        )
+        return response
+
+    async def _retrieve(
+        self,
+        document_id: str,
+        question: str,
+        student_name: Optional[str] = None,
+    ) -> Tuple[Optional[RAGResponse], Optional[np.ndarray], list[SearchResult]]:
+        """
+        Resolve everything that happens before the LLM call.
+
+        Args:
+            document_id: Document being studied
+            question: Student's question
+            student_name: Optional student name for personalization
+
+        Returns:
+            Tuple of (immediate response or None, question embedding, search results).
+            When an immediate response is returned no LLM call is needed.
+        """
         # Handle greetings
         if self._is_greeting(question):
-            return self._handle_greeting(question, student_name)
+            return self._handle_greeting(question, student_name), None, []
 
         # Check document exists
         if not await vector_store.document_exists(document_id):
@@ -105,10 +319,19 @@ class TeacherService:
                 sources=[],
                 reasoning="No document uploaded",
                 confidence=0.0,
-            )
+            ), None, []
 
         # Get relevant context
-        question_embedding = await embedding_service.generate_embedding(question)
+        question_embedding = await self._embed_question(question)
+
+        # Personalized answers are never shared through the cache
+        cached = None
+        if not student_name:
+            cached = self._get_cached_answer(document_id, question_embedding)
+        if cached is not None:
+            logger.info("Answer cache hit", document_id=document_id)
+            return cached, question_embedding, []
+
         search_results = await vector_store.search(
             document_id=document_id,
             query_embedding=question_embedding,
@@ -121,15 +344,119 @@ class TeacherService:
                 sources=[],
                 reasoning="No relevant content found",
                 confidence=0.0,
-            )
+            ), question_embedding, []
 
-        # Build context and generate teaching response
-        context = self._build_context(search_results)
-        response = await self._generate_teaching_response(
-            question, context, search_results, student_name
-        )
+        return None, question_embedding, search_results
 
-        return response
+    async def _embed_question(self, question: str) -> np.ndarray:
+        """
+        Embed a question, reusing the vector for exact repeats.
+
+        Args:
+            question: Student's question
+
+        Returns:
+            Question embedding
+        """
+        key = hashlib.sha1(question.strip().lower().encode("utf-8")).hexdigest()
+
+        embedding = self._embedding_cache.get(key)
+        if embedding is not None:
+            self._embedding_cache.move_to_end(key)
+            return embedding
+
+        embedding = await embedding_service.generate_embedding(question)
+        self._embedding_cache[key] = embedding
+        if len(self._embedding_cache) > EMBEDDING_CACHE_MAX_ENTRIES:
+            self._embedding_cache.popitem(last=False)
+        return embedding
+
+    def _remember_answer(
+        self,
+        document_id: str,
+        question: str,
+        question_embedding: np.ndarray,
+        response: RAGResponse,
+        student_name: Optional[str] = None,
+    ) -> None:
+        """Cache a generated answer unless it is personalized or a fallback."""
+        if not student_name and response.reasoning != FALLBACK_REASONING:
+            self._cache_answer(document_id, question, question_embedding, response)
+
+    def _get_cached_answer(
+        self,
+        document_id: str,
+        question_embedding: np.ndarray,
+    ) -> Optional[RAGResponse]:
+        """
+        Look up a cached answer for a semantically similar question.
+
+        Args:
+            document_id: Document being studied
+            question_embedding: Embedding of the incoming question
+
+        Returns:
+            Cached RAGResponse if a fresh entry is similar enough, else None
+        """
+        entries = self._answer_cache.get(document_id)
+        if not entries:
+            return None
+
+        # Drop expired entries (oldest first, so stop at the first fresh one)
+        cutoff = time.monotonic() - ANSWER_CACHE_TTL_SECONDS
+        while entries:
+            key, (_, _, stored_at) = next(iter(entries.items()))
+            if stored_at >= cutoff:
+                break
+            del entries[key]
+        if not entries:
+            del self._answer_cache[document_id]
+            return None
+
+        norm = np.linalg.norm(question_embedding)
+        if norm == 0:
+            return None
+        query = question_embedding / norm
+
+        keys = list(entries.keys())
+        matrix = np.vstack([entries[k][0] for k in keys])
+        similarities = matrix @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] < ANSWER_CACHE_SIMILARITY:
+            return None
+
+        self._answer_cache.move_to_end(document_id)
+        return entries[keys[best]][1]
+
+    def _cache_answer(
+        self,
+        document_id: str,
+        question: str,
+        question_embedding: np.ndarray,
+        response: RAGResponse,
+    ) -> None:
+        """Store an answer in the per-document semantic cache."""
+        norm = np.linalg.norm(question_embedding)
+        if norm == 0:
+            return
+
+        entries = self._answer_cache.get(document_id)
+        if entries is None:
+            entries = OrderedDict()
+            self._answer_cache[document_id] = entries
+            if len(self._answer_cache) > ANSWER_CACHE_MAX_DOCUMENTS:
+                self._answer_cache.popitem(last=False)
+        self._answer_cache.move_to_end(document_id)
+
+        key = question.strip().lower()
+        entries.pop(key, None)
+        entries[key] = (
+            (question_embedding / norm).astype(np.float32),
+            response,
+            time.monotonic(),
+        )
+        if len(entries) > ANSWER_CACHE_MAX_ENTRIES:
+            entries.popitem(last=False)
 
     async def voice_to_voice_chat(
         self,
@@ -195,26 +522,84 @@ class TeacherService:
         Yields:
             Audio chunks
         """
-        # Generate answer
-        response = await self.answer_student_question(
-            document_id=document_id,
-            question=question,
-            student_name=student_name,
+        voice = voice or voice_service.DEFAULT_TEACHER_VOICE
+
+        immediate, question_embedding, search_results = await self._retrieve(
+            document_id, question, student_name
         )
+        if immediate is not None or not self.client:
+            response = immediate or self._fallback_response(search_results)
+            async for chunk in self._speak(response.answer, voice):
+                yield chunk
+            return
 
-        # Stream the speech
+        # Speak the "answer" field sentence by sentence while the LLM is still writing
+        context = self._build_context(search_results)
+        answer_stream = _AnswerFieldStream()
+        content_parts: list[str] = []
+        pending = ""
+        spoken = False
+
+        try:
+            async for delta in self._stream_completion(question, context, student_name):
+                content_parts.append(delta)
+                pending += answer_stream.feed(delta)
+
+                while True:
+                    boundary = _SENTENCE_END_RE.search(pending, MIN_SPEECH_SEGMENT_CHARS)
+                    if not boundary:
+                        break
+                    segment, pending = pending[: boundary.start()], pending[boundary.end():]
+                    async for chunk in self._speak(segment, voice):
+                        spoken = True
+                        yield chunk
+
+        except Exception as e:
+            logger.error("Teaching response streaming failed", error=str(e))
+            if not spoken:
+                async for chunk in self._speak(
+                    self._fallback_response(search_results).answer, voice
+                ):
+                    yield chunk
+            return
+
+        response = self._parse_response("".join(content_parts), search_results)
+
+        # The model ignored the JSON format, so nothing was streamed yet
+        if not answer_stream.found:
+            pending = response.answer
+        if pending.strip():
+            async for chunk in self._speak(pending, voice):
+                yield chunk
+
+        self._remember_answer(
+            document_id, question, question_embedding, response, student_name
+        )
+
+    async def _speak(self, text: str, voice: str) -> AsyncGenerator[bytes, None]:
+        """Stream TTS audio for a piece of teacher speech."""
         async for chunk in voice_service.stream_speech(
-            text=response.answer,
-            voice=voice or voice_service.DEFAULT_TEACHER_VOICE,
-            speed=0.95,
+            text=text,
+            voice=voice,
+            speed=0.95,  # Slightly slower for clarity
         ):
             yield chunk
 
+    def _greeting_key(self, text: str) -> Optional[str]:
+        """Return the GREETING_RESPONSES key if text opens with a greeting."""
+        words = text.lower().split(None, 2)
+        if not words:
+            return None
+
+        key = _GREETING_WORDS.get(words[0].rstrip(_GREETING_PUNCTUATION))
+        if key is None and len(words) > 1:
+            phrase = f"{words[0]} {words[1].rstrip(_GREETING_PUNCTUATION)}"
+            key = _GREETING_PHRASES.get(phrase)
+        return key
+
     def _is_greeting(self, text: str) -> bool:
         """Check if text is a greeting."""
-        greetings = ["hello", "hi", "hey", "greetings", "good morning", "good afternoon", "good evening", "help me"]
-        text_lower = text.lower().strip()
-        return any(text_lower.startswith(g) or text_lower == g for g in greetings)
+        return self._greeting_key(text) is not None
 
     def _handle_greeting(
         self,
@@ -222,14 +607,8 @@ class TeacherService:
         student_name: Optional[str] = None,
     ) -> RAGResponse:
         """Handle greeting with a warm teacher response."""
-        text_lower = text.lower().strip()
-
-        for key, response in GREETING_RESPONSES.items():
-            if key in text_lower:
-                answer = response
-                break
-        else:
-            answer = GREETING_RESPONSES["default"]
+        key = self._greeting_key(text) or "default"
+        answer = GREETING_RESPONSES[key]
 
         # Personalize if name provided
         if student_name:
@@ -244,14 +623,43 @@ class TeacherService:
         )
 
     def _build_context(self, search_results: list[SearchResult]) -> str:
-        """Build context string from search results."""
-        context_parts = []
-        for result in search_results:
+        """
+        Build a compact context string from search results.
+
+        Weak matches are dropped (the best result is always kept), each
+        chunk is truncated, and chunks whose leading text nearly matches
+        the previous one are skipped to keep the prompt small.
+        """
+        relevant = [r for r in search_results if r.score > CONTEXT_MIN_SCORE]
+        if not relevant and search_results:
+            relevant = search_results[:1]
+
+        # One flat list of pieces joined once; no per-chunk intermediate strings
+        parts: list[str] = []
+        append = parts.append
+        previous = None
+        for result in relevant:
             chunk = result.chunk
-            context_parts.append(
-                f"[Page {chunk.page_number}]\n{chunk.text_content}"
-            )
-        return "\n\n---\n\n".join(context_parts)
+            text = truncate_text(chunk.text_content, CONTEXT_CHUNK_MAX_CHARS)
+
+            key = text[:CONTEXT_DUPLICATE_MAX_CHARS]
+            if previous is not None:
+                matcher = SequenceMatcher(None, previous, key)
+                # Cheap upper bounds first; the real ratio only runs on survivors
+                if (
+                    matcher.real_quick_ratio() > CONTEXT_DUPLICATE_RATIO
+                    and matcher.quick_ratio() > CONTEXT_DUPLICATE_RATIO
+                    and matcher.ratio() > CONTEXT_DUPLICATE_RATIO
+                ):
+                    continue
+            previous = key
+
+            append("[Page ")
+            append(str(chunk.page_number))
+            append("]\n")
+            append(text)
+            append(CONTEXT_SEPARATOR)
+        return "".join(parts[:-1])
 
     async def _generate_teaching_response(
         self,
@@ -265,31 +673,45 @@ class TeacherService:
             return self._fallback_response(search_results)
 
         try:
-            personalization = f"The student's name is {student_name}. " if student_name else ""
-            
-            user_prompt = f"""{personalization}Document Context (from the student's study material):
+            content = "".join(
+                [delta async for delta in self._stream_completion(question, context, student_name)]
+            )
+            return self._parse_response(content, search_results)
+
+        except Exception as e:
+            logger.error("Teaching response generation failed", error=str(e))
+            return self._fallback_response(search_results)
+
+    async def _stream_completion(
+        self,
+        question: str,
+        context: str,
+        student_name: Optional[str] = None,
+    ) -> AsyncGenerator[str, None]:
+        """Stream raw LLM content deltas for a teaching response."""
+        personalization = f"The student's name is {student_name}. " if student_name else ""
+
+        user_prompt = f"""{personalization}Document Context (from the student's study material):
 {context}
 
 Student's Question: {question}
 
 Please provide a warm, educational response that helps the student understand this topic. Use the teaching style described in your instructions."""
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": TEACHER_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.7,  # Slightly more creative for engaging teaching
-                max_tokens=1500,
-            )
-
-            content = response.choices[0].message.content
-            return self._parse_response(content, search_results)
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": TEACHER_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.7,  # Slightly more creative for engaging teaching
+            max_tokens=1500,
+            stream=True,
+        )
 
-        except Exception as e:
-            logger.error("Teaching response generation failed", error=str(e))
-            return self._fallback_response(search_results)
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
     def _parse_response(
         self,
@@ -297,15 +719,13 @@ Please provide a warm, educational response that helps the student understand th
         search_results: list[SearchResult],
     ) -> RAGResponse:
         """Parse LLM response into RAGResponse."""
-        import re
-
         try:
             # Extract JSON
-            json_match = re.search(r"```json\s*(.*?)\s*```", content, re.DOTALL)
+            json_match = _JSON_FENCE_RE.search(content)
             if json_match:
                 json_str = json_match.group(1)
             else:
-                json_match = re.search(r"\{.*\}", content, re.DOTALL)
+                json_match = _JSON_OBJ_RE.search(content)
                 if json_match:
                     json_str = json_match.group(0)
                 else:
@@ -380,7 +800,7 @@ Please provide a warm, educational response that helps the student understand th
                 )
                 for r in search_results[:3]
             ],
-            reasoning="Fallback using vector search",
+            reasoning=FALLBACK_REASONING,
             confidence=top.score,
         )
 
@@ -1,20 +1,76 @@
 """Vector store service using FAISS."""
 
+import asyncio
 import json
-from dataclasses import asdict, dataclass
+import os
+from collections import OrderedDict, defaultdict
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import faiss
 import numpy as np
+import orjson
 
 from app.core.config import settings
 from app.models.schemas import DocumentMetadata, TextChunk
-from app.utils.helpers import get_logger, load_json_async, save_json_async
+from app.utils.helpers import get_logger, read_file_async, save_file_async
 
 logger = get_logger(__name__)
 
+# HNSW graph parameters (used once a document is large enough to benefit)
+HNSW_MIN_VECTORS = 256
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_MIN_EF_SEARCH = 32
+
+# Approximate max L2 distance for normalized embeddings (lower distance = higher similarity)
+L2_MAX_DISTANCE = 4.0
+
+# Byte alignment for vectors handed to FAISS (AVX-512 loads)
+SIMD_ALIGNMENT = 64
+
+# Threads FAISS may use for one batched search (runs off the event loop)
+FAISS_MAX_THREADS = 4
+
+# Maximum indices loaded concurrently during startup preload
+PRELOAD_CONCURRENCY = 8
+
+# Bump when the on-disk metadata/chunks layout changes; older files get full validation
+METADATA_SCHEMA_VERSION = 1
+
+# Indices are read in place from a memory-mapped file, so the OS page cache,
+# not the process heap, holds their codes. (IO_FLAG_MMAP only maps IVF
+# inverted lists and has no effect on the SQ/HNSW-SQ indices built here.)
+INDEX_READ_FLAGS = faiss.IO_FLAG_MMAP_IFC
+
+
+def _aligned_float32(shape: Tuple[int, ...], align: int = SIMD_ALIGNMENT) -> np.ndarray:
+    """
+    Allocate an uninitialized float32 array whose data starts on an ``align``-byte boundary.
+
+    Args:
+        shape: Array shape
+        align: Required byte alignment
+
+    Returns:
+        Aligned, C-contiguous float32 array
+    """
+    nbytes = int(np.prod(shape)) * 4
+    buf = np.empty(nbytes + align, dtype=np.uint8)
+    offset = (-buf.ctypes.data) % align
+    return buf[offset:offset + nbytes].view(np.float32).reshape(shape)
+
+
+def _is_aligned_float32(array: np.ndarray, align: int = SIMD_ALIGNMENT) -> bool:
+    """Check whether an array can be handed to FAISS without realignment."""
+    return (
+        array.dtype == np.float32
+        and array.flags.c_contiguous
+        and array.ctypes.data % align == 0
+    )
+
 
 @dataclass
 class SearchResult:
@@ -33,6 +89,15 @@ class DocumentIndex:
     index: faiss.Index
     chunks: List[TextChunk]
     metadata: DocumentMetadata
+    chunks_by_page: Dict[int, List[TextChunk]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Group chunks by page in a single pass."""
+        if not self.chunks_by_page:
+            by_page = defaultdict(list)
+            for chunk in self.chunks:
+                by_page[chunk.page_number].append(chunk)
+            self.chunks_by_page = dict(by_page)
 
 
 class VectorStore:
@@ -61,31 +126,53 @@ class VectorStore:
         self.metadata_dir = metadata_dir or settings.METADATA_DIR
         self.dimensions = dimensions or settings.EMBEDDING_DIMENSIONS
 
-        # In-memory cache of loaded indices
-        self._indices: Dict[str, DocumentIndex] = {}
+        # In-memory LRU cache of loaded indices (most recently used last)
+        self._indices: OrderedDict[str, DocumentIndex] = OrderedDict()
+        self.max_cached_indices = settings.MAX_CACHED_INDICES
+
+        # Queries waiting for the next batched search, keyed by document and
+        # index (a rebuilt index gets its own queue). A key exists only while
+        # a flush loop is running for it.
+        self._pending_searches: Dict[
+            Tuple[str, int], List[Tuple[np.ndarray, int, asyncio.Future]]
+        ] = {}
+        self._flush_tasks: set = set()
+
+        faiss.omp_set_num_threads(min(FAISS_MAX_THREADS, os.cpu_count() or 1))
 
         # Ensure directories exist
         self.index_dir.mkdir(parents=True, exist_ok=True)
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
 
-    def _create_index(self) -> faiss.Index:
+    def _create_index(self, num_vectors: int) -> faiss.Index:
         """
-        Create a new FAISS index.
+        Create a new FAISS index sized for the document.
 
-        Uses IndexFlatIP (Inner Product) for cosine similarity with normalized vectors.
+        Vectors are stored as 8-bit scalar-quantized codes (4x smaller than
+        float32). Small documents use an exact scan over the codes; larger
+        documents use an HNSW graph so each query visits O(log N) vectors.
+
+        Args:
+            num_vectors: Number of vectors that will be added
 
         Returns:
-            New FAISS index
+            New (untrained) FAISS index
         """
-        # Using L2 distance for simplicity; can switch to IP with normalized vectors
-        index = faiss.IndexFlatL2(self.dimensions)
+        # Both index types use L2 distance so search scores stay comparable
+        if num_vectors < HNSW_MIN_VECTORS:
+            return faiss.IndexScalarQuantizer(
+                self.dimensions, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2
+            )
+
+        index = faiss.IndexHNSWSQ(self.dimensions, faiss.ScalarQuantizer.QT_8bit, HNSW_M)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
         return index
 
     async def add_document(
         self,
         document_id: str,
         chunks: List[TextChunk],
-        embeddings: List[np.ndarray],
+        embeddings: Union[np.ndarray, List[np.ndarray]],
         metadata: DocumentMetadata,
     ) -> bool:
         """
@@ -94,7 +181,8 @@ class VectorStore:
         Args:
             document_id: Unique document identifier
             chunks: List of text chunks
-            embeddings: Corresponding embedding vectors
+            embeddings: Corresponding embedding vectors, either an (N, d)
+                float32 matrix or a list of N vectors
             metadata: Document metadata
 
         Returns:
@@ -113,12 +201,14 @@ class VectorStore:
         )
 
         # Create new index
-        index = self._create_index()
+        index = self._create_index(len(chunks))
 
-        # Stack embeddings into matrix
-        embedding_matrix = np.vstack(embeddings).astype(np.float32)
+        # Build a contiguous float32 matrix with a single copy
+        embedding_matrix = self._to_matrix(embeddings)
 
-        # Add to index
+        # Learn quantizer ranges, then add
+        if not index.is_trained:
+            index.train(embedding_matrix)
         index.add(embedding_matrix)
 
         # Create document index object
@@ -130,11 +220,14 @@ class VectorStore:
         )
 
         # Cache in memory
-        self._indices[document_id] = doc_index
+        self._cache_index(doc_index)
 
-        # Persist to disk
+        # Persist to disk, then swap the heap-built index for a memory-mapped copy
         await self._save_index(document_id)
         await self._save_metadata(document_id, metadata, chunks)
+        doc_index.index = await asyncio.to_thread(
+            faiss.read_index, str(self.index_dir / f"{document_id}.index"), INDEX_READ_FLAGS
+        )
 
         logger.info(
             "Document added to vector store",
@@ -144,6 +237,34 @@ class VectorStore:
 
         return True
 
+    def _to_matrix(
+        self,
+        embeddings: Union[np.ndarray, List[np.ndarray]],
+    ) -> np.ndarray:
+        """
+        Convert embeddings into a contiguous, SIMD-aligned (N, d) float32 matrix.
+
+        Avoids the double copy of ``np.vstack(...).astype(...)``: aligned
+        float32 arrays are used as-is, anything else is copied once (row by
+        row for lists) into a preallocated aligned buffer.
+
+        Args:
+            embeddings: (N, d) matrix or list of N vectors
+
+        Returns:
+            Contiguous float32 embedding matrix
+        """
+        if isinstance(embeddings, np.ndarray) and _is_aligned_float32(embeddings):
+            return embeddings
+
+        matrix = _aligned_float32((len(embeddings), self.dimensions))
+        if isinstance(embeddings, np.ndarray):
+            matrix[:] = embeddings
+        else:
+            for i, embedding in enumerate(embeddings):
+                matrix[i] = embedding
+        return matrix
+
     async def search(
         self,
         document_id: str,
@@ -170,34 +291,28 @@ class VectorStore:
                 raise ValueError(f"Document not found: {document_id}")
 
         doc_index = self._indices[document_id]
+        self._indices.move_to_end(document_id)
 
         # Ensure query is correct shape
-        query = query_embedding.reshape(1, -1).astype(np.float32)
+        query = query_embedding.reshape(1, -1).astype(np.float32, copy=False)
 
         # Limit top_k to available vectors
         k = min(top_k, doc_index.index.ntotal)
 
-        # Search
-        distances, indices = doc_index.index.search(query, k)
-
-        # Convert to SearchResult objects
-        results = []
-        for rank, (idx, distance) in enumerate(zip(indices[0], distances[0])):
-            if idx < 0:  # FAISS returns -1 for invalid indices
-                continue
-
-            # Convert L2 distance to similarity score (0-1)
-            # Lower distance = higher similarity
-            max_distance = 4.0  # Approximate max L2 distance for normalized embeddings
-            score = max(0.0, 1.0 - (distance / max_distance))
-
-            results.append(
-                SearchResult(
-                    chunk=doc_index.chunks[idx],
-                    score=float(score),
-                    rank=rank + 1,
-                )
+        # Search (batched with concurrent queries on the same document)
+        distances, indices = await self._batched_search(document_id, doc_index.index, query, k)
+
+        # Convert L2 distance to similarity score (0-1) in one pass;
+        # FAISS returns -1 for invalid indices
+        valid = indices >= 0
+        scores = np.clip(1.0 - distances[valid] / L2_MAX_DISTANCE, 0.0, None)
+        chunks = doc_index.chunks
+        results = [
+            SearchResult(chunk=chunks[idx], score=score, rank=rank + 1)
+            for rank, (idx, score) in enumerate(
+                zip(indices[valid].tolist(), scores.tolist())
             )
+        ]
 
         logger.debug(
             "Vector search complete",
@@ -207,6 +322,109 @@ class VectorStore:
 
         return results
 
+    async def _batched_search(
+        self,
+        document_id: str,
+        index: faiss.Index,
+        query: np.ndarray,
+        k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run a query, batched with others on the same index when one is in progress.
+
+        With no search running the query is dispatched at once. Queries that
+        arrive while a search runs are queued and go out together as the
+        next (B, d) search.
+
+        Args:
+            document_id: Document being searched
+            index: The document's FAISS index
+            query: Query vector of shape (1, d)
+            k: Number of neighbours wanted
+
+        Returns:
+            Tuple of (distances, indices) for this query, each of length k
+        """
+        future = asyncio.get_running_loop().create_future()
+        key = (document_id, id(index))
+
+        batch = self._pending_searches.get(key)
+        if batch is None:
+            self._pending_searches[key] = [(query, k, future)]
+            task = asyncio.create_task(self._flush_searches(key, index))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+            task.add_done_callback(lambda t: self._abandon_searches(key, t))
+        else:
+            batch.append((query, k, future))
+        return await future
+
+    async def _flush_searches(self, key: Tuple[str, int], index: faiss.Index) -> None:
+        """Search queued queries as (B, d) batches until none are left waiting."""
+        batch: List[Tuple[np.ndarray, int, asyncio.Future]] = []
+        try:
+            while True:
+                batch = self._pending_searches[key]
+                if not batch:
+                    del self._pending_searches[key]
+                    return
+                # Queries arriving during this search form the next batch
+                self._pending_searches[key] = []
+                await self._search_batch(key[0], index, batch)
+        finally:
+            # Only unresolved if the loop was cancelled mid-search
+            for _, _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    def _abandon_searches(self, key: Tuple[str, int], task: asyncio.Task) -> None:
+        """Cancel queries still queued after a flush loop was cancelled or failed."""
+        if not task.cancelled() and task.exception() is None:
+            return
+        # The key is still owned by the dead loop, so no newer queries are dropped
+        for _, _, future in self._pending_searches.pop(key, []):
+            if not future.done():
+                future.cancel()
+
+    async def _search_batch(
+        self,
+        document_id: str,
+        index: faiss.Index,
+        batch: List[Tuple[np.ndarray, int, asyncio.Future]],
+    ) -> None:
+        """Run one batched FAISS search in a worker thread and resolve its futures."""
+        k = max(query_k for _, query_k, _ in batch)
+        try:
+            queries = _aligned_float32((len(batch), index.d))
+            for row, (query, _, _) in enumerate(batch):
+                queries[row] = query
+
+            # Widen the HNSW candidate list so recall holds for larger k; passed
+            # per call because the shared index may be searched concurrently
+            params = None
+            if isinstance(index, faiss.IndexHNSW):
+                params = faiss.SearchParametersHNSW(efSearch=max(HNSW_MIN_EF_SEARCH, k * 4))
+
+            distances, indices = await asyncio.to_thread(
+                index.search, queries, k, params=params
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if len(batch) > 1:
+            logger.debug(
+                "Batched vector search",
+                document_id=document_id,
+                batch_size=len(batch),
+            )
+
+        for row, (_, query_k, future) in enumerate(batch):
+            if not future.done():
+                future.set_result((distances[row, :query_k], indices[row, :query_k]))
+
     async def get_document_metadata(
         self,
         document_id: str,
@@ -221,11 +439,12 @@ class VectorStore:
             DocumentMetadata or None if not found
         """
         if document_id in self._indices:
+            self._indices.move_to_end(document_id)
             return self._indices[document_id].metadata
 
         # Try to load from disk
         metadata_path = self.metadata_dir / f"{document_id}_metadata.json"
-        data = await load_json_async(metadata_path)
+        data = await self._read_metadata_file(metadata_path)
 
         if data and "metadata" in data:
             return DocumentMetadata(**data["metadata"])
@@ -243,6 +462,7 @@ class VectorStore:
             True if document exists
         """
         if document_id in self._indices:
+            self._indices.move_to_end(document_id)
             return True
 
         # Check disk
@@ -290,7 +510,7 @@ class VectorStore:
 
         # Scan metadata directory
         for metadata_file in self.metadata_dir.glob("*_metadata.json"):
-            data = await load_json_async(metadata_file)
+            data = await self._read_metadata_file(metadata_file)
             if data and "metadata" in data:
                 documents.append(DocumentMetadata(**data["metadata"]))
 
@@ -321,6 +541,7 @@ class VectorStore:
         doc_index = self._indices.get(document_id)
         if not doc_index:
             return []
+        self._indices.move_to_end(document_id)
         
         chunks = doc_index.chunks[:max_chunks]
         logger.debug(
@@ -345,8 +566,12 @@ class VectorStore:
         Returns:
             List of chunks on that page
         """
-        all_chunks = await self.get_all_chunks(document_id)
-        return [c for c in all_chunks if c.page_number == page_number]
+        if document_id not in self._indices:
+            if not await self._load_index(document_id):
+                return []
+
+        self._indices.move_to_end(document_id)
+        return list(self._indices[document_id].chunks_by_page.get(page_number, []))
 
     async def _save_index(self, document_id: str) -> None:
         """Save FAISS index to disk."""
@@ -354,10 +579,24 @@ class VectorStore:
             return
 
         index_path = self.index_dir / f"{document_id}.index"
-        faiss.write_index(self._indices[document_id].index, str(index_path))
+        await asyncio.to_thread(
+            self._write_index_atomic, self._indices[document_id].index, index_path
+        )
 
         logger.debug("FAISS index saved", document_id=document_id)
 
+    @staticmethod
+    def _write_index_atomic(index: faiss.Index, index_path: Path) -> None:
+        """
+        Write an index to a temp file and rename it into place.
+
+        A loaded index maps its file, so overwriting it in place would
+        corrupt (or SIGBUS) any copy still being searched.
+        """
+        tmp_path = index_path.with_suffix(".index.tmp")
+        faiss.write_index(index, str(tmp_path))
+        os.replace(tmp_path, index_path)
+
     async def _save_metadata(
         self,
         document_id: str,
@@ -368,13 +607,30 @@ class VectorStore:
         metadata_path = self.metadata_dir / f"{document_id}_metadata.json"
 
         data = {
+            "schema_version": METADATA_SCHEMA_VERSION,
             "metadata": metadata.model_dump(),
             "chunks": [chunk.model_dump() for chunk in chunks],
         }
 
-        await save_json_async(metadata_path, data)
+        content = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+        await save_file_async(metadata_path, content)
         logger.debug("Metadata saved", document_id=document_id)
 
+    async def _read_metadata_file(self, path: Path) -> Optional[Dict]:
+        """
+        Read a document metadata file.
+
+        Args:
+            path: Path to the metadata JSON file
+
+        Returns:
+            Parsed metadata/chunks dictionary or None if not found
+        """
+        if not path.exists():
+            return None
+
+        return orjson.loads(await read_file_async(path))
+
     async def _load_index(self, document_id: str) -> bool:
         """
         Load a document index from disk.
@@ -392,23 +648,30 @@ class VectorStore:
             return False
 
         try:
-            # Load FAISS index
-            index = faiss.read_index(str(index_path))
+            # Load FAISS index (off the event loop; large indices take a while)
+            index = await asyncio.to_thread(faiss.read_index, str(index_path), INDEX_READ_FLAGS)
 
             # Load metadata and chunks
-            data = await load_json_async(metadata_path)
+            data = await self._read_metadata_file(metadata_path)
             if not data:
                 return False
 
             metadata = DocumentMetadata(**data["metadata"])
-            chunks = [TextChunk(**chunk) for chunk in data["chunks"]]
+
+            # Chunks were written by us in the current layout: skip re-validation
+            if data.get("schema_version") == METADATA_SCHEMA_VERSION:
+                chunks = [TextChunk.model_construct(**chunk) for chunk in data["chunks"]]
+            else:
+                chunks = [TextChunk(**chunk) for chunk in data["chunks"]]
 
             # Cache in memory
-            self._indices[document_id] = DocumentIndex(
-                document_id=document_id,
-                index=index,
-                chunks=chunks,
-                metadata=metadata,
+            self._cache_index(
+                DocumentIndex(
+                    document_id=document_id,
+                    index=index,
+                    chunks=chunks,
+                    metadata=metadata,
+                )
             )
 
             logger.debug("Index loaded from disk", document_id=document_id)
@@ -422,18 +685,35 @@ class VectorStore:
             )
             return False
 
+    def _cache_index(self, doc_index: DocumentIndex) -> None:
+        """
+        Insert an index into the LRU cache, evicting the least recently used.
+
+        Evicted indices are already persisted, so they are simply dropped.
+        """
+        self._indices[doc_index.document_id] = doc_index
+        self._indices.move_to_end(doc_index.document_id)
+
+        while len(self._indices) > self.max_cached_indices:
+            evicted_id, _ = self._indices.popitem(last=False)
+            logger.debug("Evicted index from cache", document_id=evicted_id)
+
     async def preload_all_indices(self) -> int:
         """
-        Preload all indices into memory.
+        Preload indices into memory, up to the cache limit.
 
         Returns:
             Number of indices loaded
         """
-        count = 0
-        for index_file in self.index_dir.glob("*.index"):
-            document_id = index_file.stem
-            if await self._load_index(document_id):
-                count += 1
+        index_files = list(self.index_dir.glob("*.index"))[: self.max_cached_indices]
+        semaphore = asyncio.Semaphore(PRELOAD_CONCURRENCY)
+
+        async def load_one(index_file: Path) -> bool:
+            async with semaphore:
+                return await self._load_index(index_file.stem)
+
+        results = await asyncio.gather(*(load_one(f) for f in index_files))
+        count = sum(results)
 
         logger.info("Preloaded indices", count=count)
         return count
@@ -2,21 +2,68 @@
 
 import asyncio
 import base64
+import hashlib
 import tempfile
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from dataclasses import dataclass
-from pathlib import Path
-from typing import AsyncGenerator, Optional
-
-from openai import AsyncOpenAI
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+import httpx
+from aiolimiter import AsyncLimiter
+from openai import AsyncOpenAI, RateLimitError
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 
 from app.core.config import settings
 from app.utils.helpers import get_logger
 
 logger = get_logger(__name__)
 
-# Thread pool for audio processing
-_executor = ThreadPoolExecutor(max_workers=4)
+# TTS response cache limits
+TTS_CACHE_MAX_BYTES = 256 * 1024 * 1024
+TTS_CACHE_MAX_TEXT_CHARS = 2000
+
+# Default chunk size for streamed TTS audio: 32 KB means fewer yields per MB.
+# Callers that care about time-to-first-byte can pass a smaller chunk_size,
+# down to MIN_STREAM_CHUNK_SIZE.
+STREAM_CHUNK_SIZE = 32 * 1024
+MIN_STREAM_CHUNK_SIZE = 4 * 1024
+
+# Retry policy for 429s that get past the client-side rate limiter
+RATE_LIMIT_RETRY_ATTEMPTS = 5
+RATE_LIMIT_RETRY_MAX_WAIT_SECONDS = 60
+
+T = TypeVar("T")
+
+# Streamed audio stays in memory up to this size before spilling to disk
+AUDIO_SPOOL_MAX_BYTES = 1 << 20
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Connection pool for OpenAI audio calls (HTTP/2, long-lived keep-alive)."""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=1000,
+            max_keepalive_connections=200,
+            keepalive_expiry=300,
+        ),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+    )
 
 
 @dataclass
@@ -79,11 +126,64 @@ class VoiceService:
         if not self.api_key:
             logger.warning("OpenAI API key not configured for voice service")
 
-        self.client = AsyncOpenAI(api_key=self.api_key) if self.api_key else None
+        # Created on first use and dropped by aclose(), so the service
+        # keeps working across app lifespans (reloads, test clients)
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[AsyncOpenAI] = None
+
+        # LRU of synthesized audio keyed by "voice|speed|format|sha256(text)"
+        self._tts_cache: OrderedDict[str, bytes] = OrderedDict()
+        self._tts_cache_bytes = 0
+        # In-flight TTS requests, so concurrent identical calls share one API call
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Throttle audio requests before OpenAI starts answering with 429s
+        self._rate_limiter = AsyncLimiter(settings.OPENAI_AUDIO_RPM, time_period=60)
+
+    @property
+    def client(self) -> Optional[AsyncOpenAI]:
+        """OpenAI client on this service's connection pool, or None without an API key."""
+        if self._client is None and self.api_key:
+            self._http_client = _create_http_client()
+            # SDK retries are off: _call_openai's limiter and retry policy
+            # are the only throttling and retry layer
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=self._http_client,
+                max_retries=0,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the HTTP connection pool; the next request opens a new one."""
+        http_client = self._http_client
+        self._http_client = None
+        self._client = None
+        if http_client is not None:
+            await http_client.aclose()
+
+    async def _call_openai(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an OpenAI request under the rate limiter, retrying on 429.
+
+        Args:
+            request: Zero-argument coroutine factory issuing the API call
+
+        Returns:
+            The API response
+        """
+        async for attempt in AsyncRetrying(
+            wait=wait_random_exponential(multiplier=1, max=RATE_LIMIT_RETRY_MAX_WAIT_SECONDS),
+            stop=stop_after_attempt(RATE_LIMIT_RETRY_ATTEMPTS),
+            retry=retry_if_exception_type(RateLimitError),
+            reraise=True,
+        ):
+            with attempt:
+                async with self._rate_limiter:
+                    return await request()
 
     async def transcribe_audio(
         self,
-        audio_data: bytes,
+        audio_data: Union[bytes, BinaryIO, AsyncIterator[bytes]],
         language: Optional[str] = None,
         prompt: Optional[str] = None,
     ) -> TranscriptionResult:
@@ -91,7 +191,8 @@ class VoiceService:
         Transcribe audio to text using OpenAI Whisper.
 
         Args:
-            audio_data: Audio file bytes (mp3, wav, webm, etc.)
+            audio_data: Audio bytes (mp3, wav, webm, etc.), a binary file object
+                such as UploadFile.file, or an async iterator of byte chunks
             language: Optional language code (e.g., 'en', 'es')
             prompt: Optional prompt to guide transcription
 
@@ -101,50 +202,76 @@ class VoiceService:
         if not self.client:
             raise ValueError("OpenAI client not initialized. Check API key.")
 
-        logger.info("Starting audio transcription", audio_size=len(audio_data))
+        spool = None
+        if isinstance(audio_data, (bytes, bytearray)):
+            logger.info("Starting audio transcription", audio_size=len(audio_data))
+        else:
+            if hasattr(audio_data, "__aiter__"):
+                spool = await self._spool_audio(audio_data)
+                audio_data = spool
+            logger.info("Starting audio transcription", streamed=True)
 
         try:
-            # Create temporary file for audio
-            with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as tmp:
-                tmp.write(audio_data)
-                tmp_path = tmp.name
-
-            try:
-                # Open and transcribe
-                with open(tmp_path, "rb") as audio_file:
-                    kwargs = {"model": "whisper-1", "file": audio_file}
-
-                    if language:
-                        kwargs["language"] = language
-                    if prompt:
-                        kwargs["prompt"] = prompt
-
-                    response = await self.client.audio.transcriptions.create(**kwargs)
-
-                logger.info(
-                    "Transcription complete",
-                    text_length=len(response.text),
-                )
+            # Hand the bytes straight to the SDK; no temp file round-trip
+            kwargs = {
+                "model": "whisper-1",
+                "file": ("audio.webm", audio_data, "audio/webm"),
+            }
 
-                return TranscriptionResult(
-                    text=response.text,
-                    language=language,
-                )
+            if language:
+                kwargs["language"] = language
+            if prompt:
+                kwargs["prompt"] = prompt
+
+            async def request():
+                # A retried upload must start from the beginning of the file
+                if hasattr(audio_data, "seek"):
+                    audio_data.seek(0)
+                return await self.client.audio.transcriptions.create(**kwargs)
 
-            finally:
-                # Clean up temp file
-                Path(tmp_path).unlink(missing_ok=True)
+            response = await self._call_openai(request)
+
+            logger.info(
+                "Transcription complete",
+                text_length=len(response.text),
+            )
+
+            return TranscriptionResult(
+                text=response.text,
+                language=language,
+            )
 
         except Exception as e:
             logger.error("Transcription failed", error=str(e))
             raise
 
+        finally:
+            if spool is not None:
+                spool.close()
+
+    async def _spool_audio(self, chunks: AsyncIterator[bytes]) -> BinaryIO:
+        """
+        Collect streamed audio into a spooled file for the multipart upload.
+
+        Args:
+            chunks: Async iterator of audio byte chunks
+
+        Returns:
+            File object positioned at the start of the audio
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=AUDIO_SPOOL_MAX_BYTES)
+        async for chunk in chunks:
+            spool.write(chunk)
+        spool.seek(0)
+        return spool
+
     async def synthesize_speech(
         self,
         text: str,
         voice: Optional[str] = None,
         speed: float = 1.0,
         response_format: str = "mp3",
+        use_cache: bool = True,
     ) -> SpeechResult:
         """
         Convert text to speech using OpenAI TTS.
@@ -154,6 +281,8 @@ class VoiceService:
             voice: Voice to use (alloy, echo, fable, onyx, nova, shimmer)
             speed: Speech speed (0.25 to 4.0)
             response_format: Audio format (mp3, opus, aac, flac)
+            use_cache: Serve repeated phrases from the TTS cache and share
+                identical in-flight requests
 
         Returns:
             SpeechResult with audio data
@@ -164,6 +293,66 @@ class VoiceService:
         voice = voice or self.default_voice
         speed = max(0.25, min(4.0, speed))
 
+        if use_cache:
+            key = self._tts_cache_key(text, voice, speed, response_format)
+            cached = self._tts_cache.get(key)
+            if cached is not None:
+                self._tts_cache.move_to_end(key)
+                logger.debug("TTS cache hit", text_length=len(text), voice=voice)
+                return SpeechResult(
+                    audio_data=cached,
+                    format=response_format,
+                    voice=voice,
+                )
+
+            # Piggyback on an identical request that is already in flight.
+            # The API call runs in its own task, so a caller going away
+            # (barge-in, disconnect) never aborts it for the others.
+            task = self._inflight.get(key)
+            if task is not None:
+                logger.debug("TTS request coalesced", text_length=len(text), voice=voice)
+            else:
+                task = asyncio.create_task(
+                    self._synthesize_shared(key, text, voice, speed, response_format)
+                )
+                # Retrieve the outcome even if every caller was cancelled
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                self._inflight[key] = task
+            audio_data = await asyncio.shield(task)
+        else:
+            audio_data = await self._synthesize(text, voice, speed, response_format)
+
+        return SpeechResult(
+            audio_data=audio_data,
+            format=response_format,
+            voice=voice,
+        )
+
+    async def _synthesize_shared(
+        self,
+        key: str,
+        text: str,
+        voice: str,
+        speed: float,
+        response_format: str,
+    ) -> bytes:
+        """Run one in-flight TTS request for all callers sharing its cache key."""
+        try:
+            audio_data = await self._synthesize(text, voice, speed, response_format)
+            if len(text) <= TTS_CACHE_MAX_TEXT_CHARS:
+                self._store_tts(key, audio_data)
+            return audio_data
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _synthesize(
+        self,
+        text: str,
+        voice: str,
+        speed: float,
+        response_format: str,
+    ) -> bytes:
+        """Call OpenAI TTS and return the audio bytes."""
         logger.info(
             "Synthesizing speech",
             text_length=len(text),
@@ -172,32 +361,68 @@ class VoiceService:
         )
 
         try:
-            response = await self.client.audio.speech.create(
-                model="tts-1",
-                voice=voice,
-                input=text,
-                speed=speed,
-                response_format=response_format,
+            response = await self._call_openai(
+                lambda: self.client.audio.speech.create(
+                    model="tts-1",
+                    voice=voice,
+                    input=text,
+                    speed=speed,
+                    response_format=response_format,
+                )
             )
+        except Exception as e:
+            logger.error("Speech synthesis failed", error=str(e))
+            raise
 
-            # Get audio bytes
-            audio_data = response.content
+        # Get audio bytes
+        audio_data = response.content
 
-            logger.info(
-                "Speech synthesis complete",
-                audio_size=len(audio_data),
-                format=response_format,
-            )
+        logger.info(
+            "Speech synthesis complete",
+            audio_size=len(audio_data),
+            format=response_format,
+        )
 
-            return SpeechResult(
-                audio_data=audio_data,
-                format=response_format,
-                voice=voice,
-            )
+        return audio_data
 
-        except Exception as e:
-            logger.error("Speech synthesis failed", error=str(e))
-            raise
+    def _tts_cache_key(
+        self,
+        text: str,
+        voice: str,
+        speed: float,
+        response_format: str,
+    ) -> str:
+        """Build the TTS cache key; readable prefix so entries can be invalidated by voice."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{voice}|{speed}|{response_format}|{text_hash}"
+
+    def _store_tts(self, cache_key: str, audio_data: bytes) -> None:
+        """Add audio to the TTS cache, evicting least recently used entries over the byte cap."""
+        previous = self._tts_cache.pop(cache_key, None)
+        if previous is not None:
+            self._tts_cache_bytes -= len(previous)
+
+        self._tts_cache[cache_key] = audio_data
+        self._tts_cache_bytes += len(audio_data)
+
+        while self._tts_cache_bytes > TTS_CACHE_MAX_BYTES and self._tts_cache:
+            _, evicted = self._tts_cache.popitem(last=False)
+            self._tts_cache_bytes -= len(evicted)
+
+    def invalidate_cache(self, prefix: str = "") -> int:
+        """
+        Drop cached TTS audio.
+
+        Args:
+            prefix: Key prefix to match, e.g. "nova|" for one voice; empty clears all
+
+        Returns:
+            Number of entries removed
+        """
+        keys = [key for key in self._tts_cache if key.startswith(prefix)]
+        for key in keys:
+            self._tts_cache_bytes -= len(self._tts_cache.pop(key))
+        return len(keys)
 
     async def synthesize_speech_hd(
         self,
@@ -224,12 +449,14 @@ class VoiceService:
         voice = voice or self.default_voice
 
         try:
-            response = await self.client.audio.speech.create(
-                model="tts-1-hd",
-                voice=voice,
-                input=text,
-                speed=speed,
-                response_format=response_format,
+            response = await self._call_openai(
+                lambda: self.client.audio.speech.create(
+                    model="tts-1-hd",
+                    voice=voice,
+                    input=text,
+                    speed=speed,
+                    response_format=response_format,
+                )
             )
 
             return SpeechResult(
@@ -247,6 +474,7 @@ class VoiceService:
         text: str,
         voice: Optional[str] = None,
         speed: float = 1.0,
+        chunk_size: int = STREAM_CHUNK_SIZE,
     ) -> AsyncGenerator[bytes, None]:
         """
         Stream speech synthesis for real-time playback.
@@ -255,6 +483,7 @@ class VoiceService:
             text: Text to convert
             voice: Voice to use
             speed: Speech speed
+            chunk_size: Bytes per yielded chunk (at least 4 KB)
 
         Yields:
             Audio chunks as bytes
@@ -263,8 +492,11 @@ class VoiceService:
             raise ValueError("OpenAI client not initialized. Check API key.")
 
         voice = voice or self.default_voice
+        chunk_size = max(MIN_STREAM_CHUNK_SIZE, chunk_size)
 
         try:
+            # Streams are not retried once audio has been yielded, only throttled
+            await self._rate_limiter.acquire()
             async with self.client.audio.speech.with_streaming_response.create(
                 model="tts-1",
                 voice=voice,
@@ -272,7 +504,7 @@ class VoiceService:
                 speed=speed,
                 response_format="mp3",
             ) as response:
-                async for chunk in response.iter_bytes(chunk_size=4096):
+                async for chunk in response.iter_bytes(chunk_size=chunk_size):
                     yield chunk
 
         except Exception as e:
@@ -294,7 +526,7 @@ class VoiceService:
 
         try:
             # Quick TTS test
-            result = await self.synthesize_speech("Test", speed=2.0)
+            result = await self.synthesize_speech("Test", speed=2.0, use_cache=False)
             return len(result.audio_data) > 0
         except Exception:
             return False
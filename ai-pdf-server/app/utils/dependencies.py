@@ -9,6 +9,20 @@ from app.utils.helpers import get_logger
 
 logger = get_logger(__name__)
 
+_USER_ID_HEADER = b"x-user-id"
+
+
+def _read_user_id(request: Request) -> Optional[str]:
+    """Scan raw ASGI headers for X-User-ID, decoding only the matching value."""
+    scope_headers = request.scope.get("headers")
+    if scope_headers is None:
+        return request.headers.get("x-user-id") or None
+    for key, value in scope_headers:
+        if key == _USER_ID_HEADER:
+            # Server-parsed header values carry no surrounding whitespace
+            return value.decode("latin-1") or None
+    return None
+
 
 async def get_user_id_from_header(request: Request) -> Optional[str]:
     """
@@ -23,10 +37,7 @@ async def get_user_id_from_header(request: Request) -> Optional[str]:
     Returns:
         User ID string if present, None otherwise
     """
-    user_id = request.headers.get("x-user-id")
-    if not user_id:
-        return None
-    return user_id.strip()
+    return _read_user_id(request)
 
 
 async def require_user_id(request: Request) -> str:
@@ -44,7 +55,7 @@ async def require_user_id(request: Request) -> str:
     Raises:
         HTTPException: 401 if user_id not present
     """
-    user_id = await get_user_id_from_header(request)
+    user_id = _read_user_id(request)
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
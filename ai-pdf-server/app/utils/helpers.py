@@ -1,14 +1,20 @@
 """Reusable helper utilities."""
 
 import hashlib
+import hmac
 import logging
+import os
+import re
 import sys
-import uuid
-from datetime import datetime
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 
 import aiofiles
+import aiofiles.os
+import orjson
 import structlog
 
 from app.core.config import settings
@@ -21,7 +27,12 @@ from app.core.config import settings
 
 def generate_document_id() -> str:
     """Generate a unique document ID using UUID4."""
-    return str(uuid.uuid4())
+    # Format random bytes directly instead of building a uuid.UUID object
+    raw = bytearray(os.urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
 
 def generate_chunk_id(document_id: str, page_number: int, chunk_index: int) -> str:
@@ -39,6 +50,28 @@ def generate_chunk_id(document_id: str, page_number: int, chunk_index: int) -> s
     return f"{document_id}_p{page_number}_c{chunk_index}"
 
 
+def chunk_id_factory(document_id: str, page_number: int) -> Callable[[int], str]:
+    """
+    Build a chunk ID generator for one page.
+
+    The document/page prefix is formatted once, so ingestion loops only
+    append the chunk index. IDs match generate_chunk_id.
+
+    Args:
+        document_id: The parent document ID
+        page_number: Page number where chunks originate
+
+    Returns:
+        Function mapping a chunk index to its chunk ID
+    """
+    prefix = f"{document_id}_p{page_number}_c"
+
+    def make_chunk_id(chunk_index: int) -> str:
+        return prefix + str(chunk_index)
+
+    return make_chunk_id
+
+
 # ============================================================
 # Hashing
 # ============================================================
@@ -54,9 +87,26 @@ def compute_sha256(data: bytes) -> str:
     Returns:
         Hexadecimal hash string
     """
+    # hashlib is backed by OpenSSL, which dispatches to SHA-NI where available
     return hashlib.sha256(data).hexdigest()
 
 
+async def compute_sha256_stream(reader: AsyncIterator[bytes]) -> str:
+    """
+    Compute SHA-256 hash of an async byte stream, one chunk at a time.
+
+    Args:
+        reader: Async iterator of byte chunks (e.g. an upload read in blocks)
+
+    Returns:
+        Hexadecimal hash string
+    """
+    hasher = hashlib.sha256()
+    async for chunk in reader:
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
 def verify_hash(data: bytes, expected_hash: str) -> bool:
     """
     Verify data against expected hash.
@@ -68,14 +118,42 @@ def verify_hash(data: bytes, expected_hash: str) -> bool:
     Returns:
         True if hashes match, False otherwise
     """
-    computed = compute_sha256(data)
-    return computed.lower() == expected_hash.lower()
+    try:
+        expected = bytes.fromhex(expected_hash)
+    except ValueError:
+        return False
+    # Constant-time comparison on raw digests; no hex round-trip
+    return hmac.compare_digest(hashlib.sha256(data).digest(), expected)
 
 
 # ============================================================
 # File Operations
 # ============================================================
 
+# Kernel async I/O backend (aiofile/caio), resolved lazily when enabled
+_native_aio_open = None
+_native_aio_resolved = False
+
+
+def _get_native_aio_open():
+    """Get the aiofile opener if native async I/O is enabled and installed."""
+    global _native_aio_open, _native_aio_resolved
+
+    if not settings.ENABLE_NATIVE_AIO:
+        return None
+
+    if not _native_aio_resolved:
+        # Resolve the import once; a missing package is remembered here
+        # rather than by rewriting shared settings
+        _native_aio_resolved = True
+        try:
+            from aiofile import async_open
+
+            _native_aio_open = async_open
+        except ImportError:
+            logger.warning("aiofile package not installed, native async file I/O disabled")
+    return _native_aio_open
+
 
 async def save_file_async(path: Path, content: bytes) -> None:
     """
@@ -85,7 +163,14 @@ async def save_file_async(path: Path, content: bytes) -> None:
         path: Path to save file
         content: Bytes to write
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
+    await aiofiles.os.makedirs(path.parent, exist_ok=True)
+
+    native_open = _get_native_aio_open()
+    if native_open is not None:
+        async with native_open(path, "wb") as f:
+            await f.write(content)
+        return
+
     async with aiofiles.open(path, "wb") as f:
         await f.write(content)
 
@@ -100,6 +185,11 @@ async def read_file_async(path: Path) -> bytes:
     Returns:
         File contents as bytes
     """
+    native_open = _get_native_aio_open()
+    if native_open is not None:
+        async with native_open(path, "rb") as f:
+            return await f.read()
+
     async with aiofiles.open(path, "rb") as f:
         return await f.read()
 
@@ -112,14 +202,12 @@ async def delete_file_async(path: Path) -> bool:
         path: Path to delete
 
     Returns:
-        True if deleted, False if not found
+        True if deleted, False if missing or not removable
     """
     try:
-        if path.exists():
-            path.unlink()
-            return True
-        return False
-    except Exception:
+        await aiofiles.os.remove(path)
+        return True
+    except OSError:
         return False
 
 
@@ -131,12 +219,12 @@ async def save_json_async(path: Path, data: Dict[str, Any]) -> None:
         path: Path to save JSON file
         data: Dictionary to serialize
     """
-    import json
-
-    path.parent.mkdir(parents=True, exist_ok=True)
-    content = json.dumps(data, indent=2, default=str)
-    async with aiofiles.open(path, "w") as f:
-        await f.write(content)
+    content = orjson.dumps(
+        data,
+        default=str,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+    await save_file_async(path, content)
 
 
 async def load_json_async(path: Path) -> Optional[Dict[str, Any]]:
@@ -149,14 +237,10 @@ async def load_json_async(path: Path) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary from JSON or None if not found
     """
-    import json
-
     if not path.exists():
         return None
 
-    async with aiofiles.open(path, "r") as f:
-        content = await f.read()
-        return json.loads(content)
+    return orjson.loads(await read_file_async(path))
 
 
 # ============================================================
@@ -204,6 +288,12 @@ def setup_logging() -> structlog.BoundLogger:
     return structlog.get_logger()
 
 
+@lru_cache(maxsize=256)
+def _cached_logger(name: Optional[str]) -> structlog.BoundLogger:
+    """Build the structlog logger for a name once; None is a valid key."""
+    return structlog.get_logger(name)
+
+
 def get_logger(name: Optional[str] = None) -> structlog.BoundLogger:
     """
     Get a logger instance.
@@ -214,7 +304,7 @@ def get_logger(name: Optional[str] = None) -> structlog.BoundLogger:
     Returns:
         Configured logger
     """
-    return structlog.get_logger(name)
+    return _cached_logger(name)
 
 
 # ============================================================
@@ -222,6 +312,15 @@ def get_logger(name: Optional[str] = None) -> structlog.BoundLogger:
 # ============================================================
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Control characters stripped by clean_text (newline and carriage return are
+# already folded into spaces by _WHITESPACE_RE)
+_CONTROL_CHARS_TABLE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), *range(0x7F, 0xA0)]
+)
+
+
 def clean_text(text: str) -> str:
     """
     Clean and normalize text content.
@@ -233,15 +332,17 @@ def clean_text(text: str) -> str:
         Cleaned text
     """
     # Remove excessive whitespace
-    import re
-
-    text = re.sub(r"\s+", " ", text)
+    text = _WHITESPACE_RE.sub(" ", text)
     # Remove control characters except newlines
-    text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]", "", text)
+    text = text.translate(_CONTROL_CHARS_TABLE)
     return text.strip()
 
 
-def truncate_text(text: str, max_length: int = 500, suffix: str = "...") -> str:
+_ELLIPSIS = "..."
+_ELLIPSIS_LEN = len(_ELLIPSIS)
+
+
+def truncate_text(text: str, max_length: int = 500, suffix: str = _ELLIPSIS) -> str:
     """
     Truncate text to maximum length.
 
@@ -255,7 +356,8 @@ def truncate_text(text: str, max_length: int = 500, suffix: str = "...") -> str:
     """
     if len(text) <= max_length:
         return text
-    return text[: max_length - len(suffix)] + suffix
+    suffix_len = _ELLIPSIS_LEN if suffix is _ELLIPSIS else len(suffix)
+    return text[: max_length - suffix_len] + suffix
 
 
 # ============================================================
@@ -264,8 +366,13 @@ def truncate_text(text: str, max_length: int = 500, suffix: str = "...") -> str:
 
 
 def get_utc_timestamp() -> datetime:
-    """Get current UTC timestamp."""
-    return datetime.utcnow()
+    """Get current UTC timestamp (timezone-aware)."""
+    return datetime.now(timezone.utc)
+
+
+def epoch_ms() -> int:
+    """Get current Unix time in milliseconds, for hot paths that only need ordering."""
+    return time.time_ns() // 1_000_000
 
 
 def format_timestamp(dt: datetime) -> str:
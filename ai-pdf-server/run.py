@@ -11,6 +11,7 @@ Usage:
 """
 
 import argparse
+import importlib.util
 import os
 import sys
 
@@ -62,6 +63,14 @@ def parse_args():
     return parser.parse_args()
 
 
+def fast_server_options():
+    """Use uvloop and httptools when installed, else let uvicorn pick (e.g. on Windows)."""
+    return {
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "auto",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "auto",
+    }
+
+
 def main():
     """Run the server."""
     args = parse_args()
@@ -72,6 +81,7 @@ def main():
         "host": args.host,
         "port": args.port,
         "log_level": args.log_level,
+        **fast_server_options(),
     }
 
     if args.prod:
@@ -81,8 +91,6 @@ def main():
                 "reload": False,
                 "workers": args.workers,
                 "access_log": True,
-                "loop": "uvloop",  # Faster event loop
-                "http": "httptools",  # Faster HTTP parser
             }
         )
         print(f"Starting production server on {args.host}:{args.port}")
@@ -99,6 +107,7 @@ def main():
         print(f"Starting development server on {args.host}:{args.port}")
         print("Auto-reload enabled")
 
+    print(f"Event loop: {config['loop']}, HTTP parser: {config['http']}")
     print(f"API docs: http://{args.host}:{args.port}/docs")
     print("-" * 50)
 
@@ -28,6 +28,9 @@ load_dotenv()
 
 USER_SERVICE_URL = os.getenv("USER_SERVICE_URL", "http://localhost:8001")
 
+# Maximum ownership registrations in flight at once
+MAX_CONCURRENT_REQUESTS = 50
+
 
 async def main():
     if len(sys.argv) < 2:
@@ -49,8 +52,10 @@ async def main():
 
     print(f"Found {len(docs)} document(s). Registering ownership for user {user_id}...")
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        for doc in docs:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def register(client: httpx.AsyncClient, doc) -> None:
+        async with semaphore:
             try:
                 resp = await client.post(
                     f"{USER_SERVICE_URL}/internal/documents/{doc.document_id}/ownership",
@@ -63,6 +68,10 @@ async def main():
             except Exception as e:
                 print(f"  ✗ {doc.filename}: {e}")
 
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=MAX_CONCURRENT_REQUESTS)
+    async with httpx.AsyncClient(timeout=10.0, limits=limits, http2=True) as client:
+        await asyncio.gather(*(register(client, doc) for doc in docs))
+
     print("Done. Refresh your dashboard.")
 
 
@@ -0,0 +1,88 @@
+"""Tests for incremental extraction of the streamed "answer" field."""
+
+import json
+
+import pytest
+
+from app.services.teacher_service import _AnswerFieldStream
+
+REPLACEMENT = "\ufffd"
+
+
+def _feed_all(deltas):
+    """Feed deltas in order and return the decoded answer text."""
+    stream = _AnswerFieldStream()
+    return "".join(stream.feed(delta) for delta in deltas)
+
+
+def _every_split(raw):
+    """Yield raw split into two deltas at every position."""
+    for cut in range(len(raw) + 1):
+        yield [raw[:cut], raw[cut:]]
+
+
+def test_extracts_answer_and_stops_at_closing_quote():
+    raw = '{"answer": "Hello there.", "confidence": 0.9}'
+    assert _feed_all([raw]) == "Hello there."
+
+
+def test_waits_for_answer_field_across_deltas():
+    stream = _AnswerFieldStream()
+    assert stream.feed('{"ans') == ""
+    assert not stream.found
+    assert stream.feed('wer": "Hi') == "Hi"
+    assert stream.found
+    assert stream.feed('!" , "x": "ignored"}') == "!"
+
+
+def test_ignores_input_after_answer_ends():
+    stream = _AnswerFieldStream()
+    stream.feed('{"answer": "done"')
+    assert stream.feed(', "answer": "again"}') == ""
+
+
+@pytest.mark.parametrize(
+    "answer",
+    [
+        'quote " backslash \\ slash / tab \t newline \n',
+        "café — ½",
+        "emoji \U0001F600 and \U0001D11E",
+    ],
+)
+def test_escapes_split_at_every_position(answer):
+    raw = '{"answer": ' + json.dumps(answer) + "}"
+    for deltas in _every_split(raw):
+        assert _feed_all(deltas) == answer
+
+
+def test_surrogate_pair_fed_one_character_at_a_time():
+    raw = '{"answer": "a\\ud83d\\ude00b"}'
+    assert _feed_all(list(raw)) == "a\U0001F600b"
+
+
+@pytest.mark.parametrize(
+    "escaped, expected",
+    [
+        # Non-hex digits: only "\u" is dropped, the rest is kept
+        ("\\u12zz", REPLACEMENT + "12zz"),
+        ("\\u+1ab", REPLACEMENT + "+1ab"),
+        # Malformed escape right before the closing quote
+        ("x\\u12", "x" + REPLACEMENT + "12"),
+        # Lone low surrogate
+        ("\\udc00x", REPLACEMENT + "x"),
+        # High surrogate followed by plain text
+        ("\\ud83dx", REPLACEMENT + "x"),
+        # High surrogate followed by a non-\u escape
+        ("\\ud83d\\n", REPLACEMENT + "\n"),
+        # High surrogate followed by a non-low-surrogate \u escape
+        ("\\ud83d\\u0041", REPLACEMENT + "A"),
+        # High surrogate followed by a malformed \u escape
+        ("\\ud83d\\uzz", REPLACEMENT + REPLACEMENT + "zz"),
+        # High surrogate at the end of the string
+        ("\\ud83d", REPLACEMENT),
+    ],
+)
+def test_malformed_unicode_escapes_decode_to_replacement(escaped, expected):
+    raw = '{"answer": "' + escaped + '"}'
+    for deltas in _every_split(raw):
+        assert _feed_all(deltas) == expected
@@ -13,6 +13,20 @@ export const voiceKeys = {
   health: () => [...voiceKeys.all, "health"] as const,
 };
 
+// Binary frames sent on the voice WebSockets: the first byte is the message
+// type, the rest is its payload (raw audio for audio chunks)
+const VOICE_FRAME_AUDIO_CHUNK = 0x01;
+const VOICE_FRAME_INTERRUPT = 0x02;
+
+function voiceAudioFrame(audio: ArrayBuffer): Uint8Array {
+  const frame = new Uint8Array(audio.byteLength + 1);
+  frame[0] = VOICE_FRAME_AUDIO_CHUNK;
+  frame.set(new Uint8Array(audio), 1);
+  return frame;
+}
+
+const VOICE_INTERRUPT_FRAME = new Uint8Array([VOICE_FRAME_INTERRUPT]);
+
 // ============================================================================
 // Voice API Hooks
 // ============================================================================
@@ -369,6 +383,7 @@ export function useRealtimeVoice(documentId: string) {
         JSON.stringify({
           type: "config",
           voice: selectedVoice,
+          binary_audio: true,
         }),
       );
     };
@@ -414,13 +429,13 @@ export function useRealtimeVoice(documentId: string) {
 
   const sendAudio = useCallback((audioData: ArrayBuffer) => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
-      wsRef.current.send(audioData);
+      wsRef.current.send(voiceAudioFrame(audioData));
     }
   }, []);
 
   const interrupt = useCallback(() => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
-      wsRef.current.send(JSON.stringify({ type: "interrupt" }));
+      wsRef.current.send(VOICE_INTERRUPT_FRAME);
       stopPlayback();
       audioQueueRef.current = [];
     }
@@ -654,17 +669,23 @@ export function useVoiceCall(documentId: string) {
   const MIN_BUFFER_SAMPLES = 1440; // 60ms at 24kHz
 
   const playPCM16Audio = useCallback(
-    async (base64Data: string) => {
+    async (audioData: string | ArrayBuffer) => {
       try {
-        // Decode base64 to ArrayBuffer
-        const binaryString = atob(base64Data);
-        const bytes = new Uint8Array(binaryString.length);
-        for (let i = 0; i < binaryString.length; i++) {
-          bytes[i] = binaryString.charCodeAt(i);
+        let buffer: ArrayBuffer;
+        if (typeof audioData === "string") {
+          // Decode base64 to ArrayBuffer
+          const binaryString = atob(audioData);
+          const bytes = new Uint8Array(binaryString.length);
+          for (let i = 0; i < binaryString.length; i++) {
+            bytes[i] = binaryString.charCodeAt(i);
+          }
+          buffer = bytes.buffer;
+        } else {
+          buffer = audioData;
         }
 
         // Convert PCM16 to Float32
-        const pcm16 = new Int16Array(bytes.buffer);
+        const pcm16 = new Int16Array(buffer);
         const float32 = new Float32Array(pcm16.length);
         for (let i = 0; i < pcm16.length; i++) {
           float32[i] = pcm16[i] / 32768;
@@ -849,6 +870,8 @@ export function useVoiceCall(documentId: string) {
         ? `${wsUrl}${path}?token=${encodeURIComponent(token)}`
         : `${wsUrl}${path}`;
       const ws = new WebSocket(url);
+      // AI audio arrives as raw PCM16 binary frames (binary_audio below)
+      ws.binaryType = "arraybuffer";
 
       // Track if call has been started (wait for call_started message)
       let callStarted = false;
@@ -856,7 +879,7 @@ export function useVoiceCall(documentId: string) {
       ws.onopen = async () => {
         // Send start_call message immediately when WebSocket opens
         console.log("WebSocket opened, sending start_call");
-        ws.send(JSON.stringify({ type: "start_call" }));
+        ws.send(JSON.stringify({ type: "start_call", binary_audio: true }));
 
         // Set up AudioWorklet AFTER WebSocket is open
         // But don't start sending audio until call_started is received
@@ -884,20 +907,8 @@ export function useVoiceCall(documentId: string) {
             ws.readyState === WebSocket.OPEN &&
             event.data.pcm16
           ) {
-            // Convert ArrayBuffer to base64
-            const bytes = new Uint8Array(event.data.pcm16);
-            let binary = "";
-            for (let i = 0; i < bytes.byteLength; i++) {
-              binary += String.fromCharCode(bytes[i]);
-            }
-            const base64 = btoa(binary);
-
-            ws.send(
-              JSON.stringify({
-                type: "audio_chunk",
-                data: base64,
-              }),
-            );
+            // Raw PCM16 behind the audio_chunk opcode byte, no base64
+            ws.send(voiceAudioFrame(event.data.pcm16));
           }
         };
 
@@ -934,6 +945,13 @@ export function useVoiceCall(documentId: string) {
       };
 
       ws.onmessage = (event) => {
+        if (event.data instanceof ArrayBuffer) {
+          // Binary frame: raw PCM16 audio chunk
+          if (!rejectAudioRef.current) {
+            playPCM16Audio(event.data);
+          }
+          return;
+        }
         try {
           const data = JSON.parse(event.data) as CallMessage;
 
@@ -955,7 +973,7 @@ export function useVoiceCall(documentId: string) {
       setError(e instanceof Error ? e.message : "Failed to start call");
       setCallState("error");
     }
-  }, [documentId, callState, isMuted, handleMessage]);
+  }, [documentId, callState, isMuted, handleMessage, playPCM16Audio]);
 
   // End call
   const endCall = useCallback(() => {
@@ -1056,7 +1074,7 @@ export function useVoiceCall(documentId: string) {
     clearAudioQueue();
 
     if (wsRef.current?.readyState === WebSocket.OPEN) {
-      wsRef.current.send(JSON.stringify({ type: "interrupt" }));
+      wsRef.current.send(VOICE_INTERRUPT_FRAME);
     }
   }, [clearAudioQueue]);
 
@@ -19,15 +19,23 @@ class Settings:
     APP_VERSION: str = os.getenv("APP_VERSION", "1.0.0")
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO").upper()
     
     # Server settings
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8080"))
+    # Uvicorn worker processes; 0 means one per CPU (always 1 in DEBUG/reload)
+    WORKERS: int = int(os.getenv("WORKERS", "0"))
     
     # Backend service URLs
     PDF_SERVICE_URL: str = os.getenv("PDF_SERVICE_URL", "http://localhost:8000")
     USER_SERVICE_URL: str = os.getenv("USER_SERVICE_URL", "http://localhost:8001")
     
+    # Public-facing scheme/host sent as X-Forwarded-Proto/Host; empty means
+    # take them from each request
+    PUBLIC_SCHEME: str = os.getenv("PUBLIC_SCHEME", "")
+    PUBLIC_HOST: str = os.getenv("PUBLIC_HOST", "")
+    
     # JWT settings (for validating tokens from User-Service)
     SUPABASE_JWT_SECRET: str = os.getenv("SUPABASE_JWT_SECRET", "")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
@@ -42,6 +50,15 @@ class Settings:
     REQUEST_TIMEOUT: float = float(os.getenv("REQUEST_TIMEOUT", "60"))
     CONNECT_TIMEOUT: float = float(os.getenv("CONNECT_TIMEOUT", "10"))
     
+    # Backend connection pool
+    PROXY_HTTP2: bool = os.getenv("PROXY_HTTP2", "true").lower() == "true"
+    # Speak HTTP/2 without ALPN on http:// backends (h2c); backends must
+    # be served by an HTTP/2-capable server such as hypercorn
+    PROXY_HTTP2_PRIOR_KNOWLEDGE: bool = os.getenv("PROXY_HTTP2_PRIOR_KNOWLEDGE", "false").lower() == "true"
+    PROXY_MAX_CONNECTIONS: int = int(os.getenv("PROXY_MAX_CONNECTIONS", "1000"))
+    PROXY_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("PROXY_MAX_KEEPALIVE_CONNECTIONS", "200"))
+    PROXY_KEEPALIVE_EXPIRY: float = float(os.getenv("PROXY_KEEPALIVE_EXPIRY", "60"))
+    
     # Rate limiting
     RATE_LIMIT_REQUESTS: int = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
     RATE_LIMIT_WINDOW: int = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
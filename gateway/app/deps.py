@@ -0,0 +1,17 @@
+"""
+Request accessors shared by the proxy routers.
+"""
+
+from typing import Dict
+
+from fastapi import Request
+
+
+def get_auth_headers(request: Request) -> Dict[str, str]:
+    """
+    Get the user headers resolved by AuthASGIMiddleware.
+
+    A plain function rather than a Depends dependency, so reading the
+    headers costs no dependency resolution.
+    """
+    return request.scope["user_headers"]
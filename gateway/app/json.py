@@ -0,0 +1,20 @@
+"""
+JSON helpers for the gateway, backed by orjson.
+"""
+
+from typing import Any, Callable, Optional, Union
+
+import orjson
+
+# Subclass of json.JSONDecodeError (and ValueError)
+JSONDecodeError = orjson.JSONDecodeError
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    return orjson.dumps(obj, default=default)
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Deserialize JSON from bytes or str."""
+    return orjson.loads(data)
@@ -7,6 +7,8 @@ import sys
 
 import structlog
 
+from app import json
+
 
 def setup_logging(log_level: str = "INFO") -> None:
     """Configure structured logging."""
@@ -16,18 +18,27 @@ def setup_logging(log_level: str = "INFO") -> None:
         level=getattr(logging, log_level.upper(), logging.INFO),
     )
     
+    # Production logs are rendered by orjson straight to bytes, skipping
+    # the str round-trip of the stdlib json renderer
+    if log_level == "DEBUG":
+        renderer = structlog.dev.ConsoleRenderer()
+        logger_factory = structlog.PrintLoggerFactory()
+    else:
+        renderer = structlog.processors.JSONRenderer(serializer=json.dumps)
+        logger_factory = structlog.BytesLoggerFactory()
+    
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.dev.ConsoleRenderer() if log_level == "DEBUG" else structlog.processors.JSONRenderer(),
+            renderer,
         ],
         wrapper_class=structlog.make_filtering_bound_logger(
             getattr(logging, log_level.upper(), logging.INFO)
         ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
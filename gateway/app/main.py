@@ -3,6 +3,7 @@ API Gateway for Study With Me platform.
 Routes requests to appropriate backend microservices.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime
 
@@ -12,12 +13,17 @@ from fastapi.responses import JSONResponse
 
 from app.config import settings
 from app.logging import setup_logging, get_logger
+from app.middleware import AuthASGIMiddleware
 from app.proxy import proxy_service
+from app.routes import auth, profile, documents, chat, voice, websocket, verification, dashboard
 
 # Setup logging
-setup_logging("DEBUG" if settings.DEBUG else "INFO")
+setup_logging(settings.LOG_LEVEL)
 logger = get_logger(__name__)
 
+# Per-probe timeout for /health/backends (seconds)
+BACKEND_HEALTH_TIMEOUT = 5.0
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -61,7 +67,10 @@ All endpoints are available through this single gateway (port 8080).
         redoc_url="/redoc" if not settings.is_production else None,
     )
     
-    # Configure CORS
+    # Authenticate proxied API requests once, before routing
+    app.add_middleware(AuthASGIMiddleware)
+    
+    # Configure CORS (outermost, so preflight and 401 responses get CORS headers)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.CORS_ORIGINS,
@@ -81,8 +90,6 @@ All endpoints are available through this single gateway (port 8080).
 
 def register_routes(app: FastAPI) -> None:
     """Register all route handlers."""
-    from app.routes import auth, profile, documents, chat, voice, websocket, verification, dashboard
-    
     # API routes
     app.include_router(auth.router)
     app.include_router(profile.router)
@@ -125,30 +132,15 @@ def register_routes(app: FastAPI) -> None:
     @app.get("/health/backends", tags=["Health"])
     async def backends_health():
         """Check health of all backend services."""
-        import httpx
-        
-        results = {}
-        
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            # Check PDF Service
-            try:
-                resp = await client.get(f"{settings.PDF_SERVICE_URL}/health")
-                results["pdf_service"] = {
-                    "status": "healthy" if resp.status_code == 200 else "unhealthy",
-                    "response_code": resp.status_code
-                }
-            except Exception as e:
-                results["pdf_service"] = {"status": "unreachable", "error": str(e)}
-            
-            # Check User Service
-            try:
-                resp = await client.get(f"{settings.USER_SERVICE_URL}/health")
-                results["user_service"] = {
-                    "status": "healthy" if resp.status_code == 200 else "unhealthy",
-                    "response_code": resp.status_code
-                }
-            except Exception as e:
-                results["user_service"] = {"status": "unreachable", "error": str(e)}
+        # Probe both backends concurrently over the proxy's pooled client
+        pdf_result, user_result = await asyncio.gather(
+            _probe_backend(f"{settings.PDF_SERVICE_URL}/health"),
+            _probe_backend(f"{settings.USER_SERVICE_URL}/health"),
+        )
+        results = {
+            "pdf_service": pdf_result,
+            "user_service": user_result,
+        }
         
         all_healthy = all(r.get("status") == "healthy" for r in results.values())
         
@@ -158,6 +150,18 @@ def register_routes(app: FastAPI) -> None:
         }
 
 
+async def _probe_backend(url: str) -> dict:
+    """GET a backend health URL and summarize the result."""
+    try:
+        resp = await proxy_service.client.get(url, timeout=BACKEND_HEALTH_TIMEOUT)
+        return {
+            "status": "healthy" if resp.status_code == 200 else "unhealthy",
+            "response_code": resp.status_code
+        }
+    except Exception as e:
+        return {"status": "unreachable", "error": str(e)}
+
+
 def register_exception_handlers(app: FastAPI) -> None:
     """Register global exception handlers."""
     
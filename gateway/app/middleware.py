@@ -3,18 +3,137 @@ Authentication middleware for the gateway.
 Validates JWT tokens and injects user info into requests.
 """
 
-from typing import Optional, Tuple
+import base64
+import binascii
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
 from fastapi import Request, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 
+from app import json
 from app.config import settings
 from app.logging import get_logger
 
 logger = get_logger(__name__)
 
-security = HTTPBearer(auto_error=False)
+# Decoded-token cache limits; entries also expire at the token's exp claim
+TOKEN_CACHE_MAX_ENTRIES = 10_000
+TOKEN_CACHE_MAX_TTL_SECONDS = 3600
+# 401 details for protected paths
+AUTH_REQUIRED_DETAIL = "Authentication required"
+MALFORMED_TOKEN_DETAIL = "Malformed token"
+
+# Tokens that failed to decode, remembered so repeats skip the decode
+BAD_TOKEN_CACHE_MAX_ENTRIES = 4096
+
+# Accepted signing algorithms for verified decodes, built once
+_JWT_ALGORITHMS = (settings.JWT_ALGORITHM,)
+
+
+def _decode_unverified(token: str) -> dict:
+    """
+    Decode a JWT payload without verifying it.
+
+    Reads the middle segment directly (base64url + orjson) instead of going
+    through PyJWT, which skips signature and claim checks in this mode anyway.
+
+    Raises:
+        jwt.DecodeError: If the token is not a well-formed JWS with a JSON object payload
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise jwt.DecodeError("Not enough segments")
+
+    payload_b64 = parts[1]
+    payload_b64 += "=" * (-len(payload_b64) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
+    except (binascii.Error, ValueError) as e:
+        raise jwt.DecodeError(f"Invalid payload: {e}") from e
+
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError("Invalid payload: not a JSON object")
+    return payload
+
+
+class TokenCache:
+    """
+    LRU cache of decoded JWT payloads and their forwarded user headers.
+
+    Keyed by a BLAKE2b digest of the raw token so tokens are not kept
+    in memory verbatim.
+    """
+
+    def __init__(self, max_entries: int, max_ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_ttl_seconds = max_ttl_seconds
+        self._entries: OrderedDict[bytes, Tuple[float, dict, Dict[str, str]]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[Tuple[dict, Dict[str, str]]]:
+        """Return (payload, user_headers) for a cached, unexpired token."""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, payload, headers = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return payload, headers
+
+    def put(self, token: str, payload: dict, headers: Dict[str, str]) -> None:
+        """Cache a decoded token until its exp claim (capped at the max TTL)."""
+        now = time.time()
+        expires_at = now + self.max_ttl_seconds
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        if expires_at <= now:
+            return
+
+        key = self._key(token)
+        self._entries[key] = (expires_at, payload, headers)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class BadTokenCache:
+    """
+    Bounded LRU set of tokens that already failed to decode.
+
+    Uses the same digest keys as TokenCache. Malformed tokens never
+    become valid, so entries need no expiry.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, None] = OrderedDict()
+
+    def __contains__(self, token: str) -> bool:
+        key = TokenCache._key(token)
+        if key not in self._entries:
+            return False
+        self._entries.move_to_end(key)
+        return True
+
+    def add(self, token: str) -> None:
+        """Remember a rejected token, evicting the least recently seen."""
+        key = TokenCache._key(token)
+        self._entries[key] = None
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
 
 
 class AuthMiddleware:
@@ -43,6 +162,9 @@ class AuthMiddleware:
         "/api/auth/linkedin",
         "/api/auth/linkedin/redirect",
         "/api/auth/callback",
+        # Voice service metadata
+        "/api/voice/voices",
+        "/api/voice/health",
     }
     
     # Path prefixes that are public
@@ -51,17 +173,25 @@ class AuthMiddleware:
         "/redoc",
     }
     
+    # Protected paths whose backend (User-Service) verifies the bearer token
+    # itself and ignores X-User-* headers; the gateway only checks presence
+    TOKEN_PASSTHROUGH_PREFIXES = (
+        "/api/profile",
+    )
+    
+    # str.startswith accepts a tuple and checks every prefix in C
+    _PREFIX_TUPLE = tuple(PUBLIC_PREFIXES)
+    
+    # Decoded payloads for recently seen tokens
+    _token_cache = TokenCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_MAX_TTL_SECONDS)
+    _bad_tokens = BadTokenCache(BAD_TOKEN_CACHE_MAX_ENTRIES)
+    # Voice-call WebSocket headers derived from recently seen tokens
+    _ws_header_cache = TokenCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_MAX_TTL_SECONDS)
+    
     @classmethod
     def is_public_path(cls, path: str) -> bool:
         """Check if path is public (no auth required)."""
-        if path in cls.PUBLIC_PATHS:
-            return True
-        
-        for prefix in cls.PUBLIC_PREFIXES:
-            if path.startswith(prefix):
-                return True
-        
-        return False
+        return path in cls.PUBLIC_PATHS or path.startswith(cls._PREFIX_TUPLE)
     
     @classmethod
     def extract_token(cls, request: Request) -> Optional[str]:
@@ -90,7 +220,7 @@ class AuthMiddleware:
             payload = jwt.decode(
                 token,
                 settings.SUPABASE_JWT_SECRET,
-                algorithms=[settings.JWT_ALGORITHM],
+                algorithms=_JWT_ALGORITHMS,
                 audience="authenticated"
             )
             return True, payload, None
@@ -112,39 +242,93 @@ class AuthMiddleware:
         Returns user payload if authenticated, None if public path,
         raises HTTPException if auth required but no token provided.
         """
+        payload, _ = cls.authenticate_request(request)
+        return payload
+    
+    @classmethod
+    def authenticate_request(cls, request: Request) -> Tuple[Optional[dict], Dict[str, str]]:
+        """
+        Authenticate a request and resolve the headers to forward.
+        
+        Returns:
+            Tuple of (payload, user_headers); (None, {}) for public paths and
+            for TOKEN_PASSTHROUGH_PREFIXES, where the token is not decoded
+        
+        Raises:
+            HTTPException: 401 if auth required but token missing or malformed
+        """
+        payload, headers, error = cls.try_authenticate(request)
+        if error is not None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=error,
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        return payload, headers
+    
+    @classmethod
+    def try_authenticate(
+        cls, request: Request
+    ) -> Tuple[Optional[dict], Dict[str, str], Optional[str]]:
+        """
+        Non-raising form of authenticate_request.
+        
+        Returns:
+            Tuple of (payload, user_headers, error). error is None on success,
+            otherwise AUTH_REQUIRED_DETAIL or MALFORMED_TOKEN_DETAIL.
+        """
         path = request.url.path
         
         # Check if path is public
         if cls.is_public_path(path):
-            return None
+            return None, {}, None
         
         # Extract token
         token = cls.extract_token(request)
         
         if not token:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authentication required",
-                headers={"WWW-Authenticate": "Bearer"}
-            )
+            return None, {}, AUTH_REQUIRED_DETAIL
+        
+        # Backend parses the forwarded Authorization header; skip the decode
+        if path.startswith(cls.TOKEN_PASSTHROUGH_PREFIXES):
+            return None, {}, None
         
         # Decode token WITHOUT validation to extract claims
         # Actual validation is done by downstream services
         try:
-            # Decode without verification to get payload
-            payload = jwt.decode(
-                token,
-                options={"verify_signature": False},
-                audience="authenticated"
-            )
-            return payload
+            payload, headers = cls.resolve_token(token)
         except jwt.InvalidTokenError:
             # If we can't even decode the token structure, it's malformed
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Malformed token",
-                headers={"WWW-Authenticate": "Bearer"}
-            )
+            return None, {}, MALFORMED_TOKEN_DETAIL
+        return payload, headers, None
+    
+    @classmethod
+    def resolve_token(cls, token: str) -> Tuple[dict, Dict[str, str]]:
+        """
+        Decode a token without verification, using the token cache.
+
+        Returns:
+            Tuple of (payload, user_headers). Both are shared cache
+            entries and must not be mutated.
+
+        Raises:
+            jwt.InvalidTokenError: If the token cannot be decoded
+        """
+        cached = cls._token_cache.get(token)
+        if cached is not None:
+            return cached
+
+        if token in cls._bad_tokens:
+            raise jwt.DecodeError("Previously rejected token")
+
+        try:
+            payload = _decode_unverified(token)
+        except jwt.InvalidTokenError:
+            cls._bad_tokens.add(token)
+            raise
+        headers = cls.get_user_headers(payload)
+        cls._token_cache.put(token, payload, headers)
+        return payload, headers
     
     @classmethod
     def get_user_headers(cls, payload: dict) -> dict:
@@ -188,20 +372,126 @@ class AuthMiddleware:
         
         try:
             # Decode without verification to get payload
-            payload = jwt.decode(
-                token,
-                options={"verify_signature": False},
-                audience="authenticated"
-            )
-            
-            user_meta = payload.get("user_metadata") or {}
-            return {
-                "user_id": payload.get("sub", ""),
-                "email": payload.get("email") or user_meta.get("email", ""),
-                "role": payload.get("role", "student"),
-            }
+            payload, _ = cls.resolve_token(token)
         except jwt.InvalidTokenError:
             return None
+        return cls._user_info(payload)
+    
+    @classmethod
+    def get_ws_user_headers(cls, token: str) -> Dict[str, str]:
+        """
+        Resolve the headers forwarded on a voice-call WebSocket, cached per token.
+        
+        Reconnects with the same token skip the decode and dict building.
+        
+        Args:
+            token: Raw bearer token (without the "Bearer " prefix)
+        
+        Returns:
+            X-User-ID/X-User-Email headers, or {} if the token is malformed or
+            has no subject. The dict is a shared cache entry; do not mutate it.
+        """
+        cached = cls._ws_header_cache.get(token)
+        if cached is not None:
+            return cached[1]
+        
+        try:
+            payload, _ = cls.resolve_token(token)
+        except jwt.InvalidTokenError:
+            return {}
+        
+        user_info = cls._user_info(payload)
+        # The payload is unverified here: a null or non-string sub/email
+        # must not raise before the WebSocket is accepted
+        user_id = user_info["user_id"]
+        user_id = user_id.strip() if isinstance(user_id, str) else ""
+        email = user_info["email"]
+        headers = {}
+        if user_id:
+            headers = {
+                "X-User-ID": user_id,
+                "X-User-Email": email if isinstance(email, str) else "",
+            }
+        cls._ws_header_cache.put(token, payload, headers)
+        return headers
+    
+    @staticmethod
+    def _user_info(payload: dict) -> dict:
+        """Extract user_id, email and role from a decoded payload."""
+        user_meta = payload.get("user_metadata") or {}
+        return {
+            "user_id": payload.get("sub", ""),
+            "email": payload.get("email") or user_meta.get("email", ""),
+            "role": payload.get("role", "student"),
+        }
+
+
+def _build_unauthorized(detail: str) -> Tuple[bytes, Tuple[Tuple[bytes, bytes], ...]]:
+    """Encode a 401 JSON body and its raw response headers once."""
+    body = json.dumps({"detail": detail})
+    headers = (
+        (b"content-length", str(len(body)).encode("latin-1")),
+        (b"content-type", b"application/json"),
+        (b"www-authenticate", b"Bearer"),
+    )
+    return body, headers
+
+
+class AuthASGIMiddleware:
+    """
+    ASGI middleware that authenticates proxied API requests once per request.
+    
+    For paths under PROTECTED_PREFIXES, the user headers to forward are
+    stored in the ASGI scope (scope["user_headers"]) and the decoded payload
+    on request.state.user_payload. Routes read the scope entry directly
+    instead of resolving a per-route dependency.
+    Auth failures are answered here with the usual 401 JSON body, sent
+    from precomputed bytes without raising HTTPException.
+    """
+    
+    # Route groups whose handlers forward user headers to backends
+    PROTECTED_PREFIXES = (
+        "/api/chat",
+        "/api/documents",
+        "/api/profile",
+        "/api/dashboard",
+        "/api/verify",
+        "/api/voice",
+    )
+    
+    # Prebuilt 401 (body, raw headers) keyed by detail message
+    _UNAUTHORIZED_RESPONSES = {
+        detail: _build_unauthorized(detail)
+        for detail in (AUTH_REQUIRED_DETAIL, MALFORMED_TOKEN_DETAIL)
+    }
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.PROTECTED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        payload, headers, error = AuthMiddleware.try_authenticate(request)
+        if error is not None:
+            await self._send_unauthorized(send, *self._UNAUTHORIZED_RESPONSES[error])
+            return
+        
+        request.state.user_payload = payload
+        scope["user_headers"] = headers
+        await self.app(scope, receive, send)
+    
+    @staticmethod
+    async def _send_unauthorized(send, body: bytes, headers: Tuple[Tuple[bytes, bytes], ...]) -> None:
+        """Send a prebuilt 401 response; outer middleware (CORS) mutates the header list, so copy it."""
+        await send({
+            "type": "http.response.start",
+            "status": 401,
+            "headers": list(headers),
+        })
+        await send({"type": "http.response.body", "body": body})
 
 
 auth_middleware = AuthMiddleware()
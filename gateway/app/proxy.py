@@ -3,19 +3,59 @@ HTTP Proxy service for forwarding requests to backend services.
 """
 
 import asyncio
-from typing import Optional, Dict, Any, Tuple
-from urllib.parse import urljoin
+import logging
+from types import MappingProxyType
+from typing import AsyncIterator, Optional, Dict, Any, Mapping, Tuple
 
 import httpx
 from fastapi import Request, Response
 from starlette.responses import StreamingResponse
 from starlette.background import BackgroundTask
 
+from app import json
 from app.config import settings
 from app.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Request headers not forwarded to backends (hop-by-hop, plus recomputed ones).
+# Starlette exposes raw header names as lowercase bytes.
+_EXCLUDED_REQUEST_HEADERS = frozenset({
+    b"host", b"connection", b"keep-alive", b"proxy-authenticate",
+    b"proxy-authorization", b"te", b"trailers", b"transfer-encoding",
+    b"upgrade", b"content-length",
+})
+
+# X-Forwarded-Proto/Host fixed by configuration, copied into every request
+_STATIC_FORWARDED_HEADERS: Mapping[str, str] = MappingProxyType({
+    name: value
+    for name, value in (
+        ("X-Forwarded-Proto", settings.PUBLIC_SCHEME),
+        ("X-Forwarded-Host", settings.PUBLIC_HOST),
+    )
+    if value
+})
+
+# Methods forwarded without a body; none of the backends read one for these
+_BODILESS_METHODS = frozenset({"GET", "HEAD", "DELETE"})
+
+# Response headers dropped before relaying to the client
+_HOP_BY_HOP_BYTES = frozenset({b"transfer-encoding", b"connection", b"keep-alive"})
+
+# Static error bodies for backend failures
+_ERR_503 = b'{"error":"Service Unavailable","message":"Backend service is not responding"}'
+_ERR_504 = b'{"error":"Gateway Timeout","message":"Backend service timed out"}'
+
+# Backend base URLs, fixed at import time; unknown services fall back to pdf
+_SERVICE_URLS: Mapping[str, str] = MappingProxyType({
+    "pdf": settings.PDF_SERVICE_URL,
+    "user": settings.USER_SERVICE_URL,
+})
+# Parsed once; requests only swap in path and query
+_SERVICE_BASE_URLS: Mapping[str, httpx.URL] = MappingProxyType({
+    service: httpx.URL(url) for service, url in _SERVICE_URLS.items()
+})
+
 
 class ProxyService:
     """
@@ -41,7 +81,14 @@ class ProxyService:
                 pool=settings.CONNECT_TIMEOUT
             ),
             follow_redirects=True,
-            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+            http2=settings.PROXY_HTTP2 or settings.PROXY_HTTP2_PRIOR_KNOWLEDGE,
+            # HTTP/2 only (prior knowledge) when HTTP/1.1 is disabled
+            http1=not settings.PROXY_HTTP2_PRIOR_KNOWLEDGE,
+            limits=httpx.Limits(
+                max_keepalive_connections=settings.PROXY_MAX_KEEPALIVE_CONNECTIONS,
+                max_connections=settings.PROXY_MAX_CONNECTIONS,
+                keepalive_expiry=settings.PROXY_KEEPALIVE_EXPIRY
+            )
         )
         logger.info("ProxyService started")
     
@@ -61,11 +108,7 @@ class ProxyService:
     
     def get_service_url(self, service: str) -> str:
         """Get base URL for a service."""
-        services = {
-            "pdf": settings.PDF_SERVICE_URL,
-            "user": settings.USER_SERVICE_URL,
-        }
-        return services.get(service, settings.PDF_SERVICE_URL)
+        return _SERVICE_URLS.get(service, _SERVICE_URLS["pdf"])
     
     def _prepare_headers(self, request: Request, extra_headers: Dict[str, str] = None) -> Dict[str, str]:
         """
@@ -73,23 +116,21 @@ class ProxyService:
         
         Preserves important headers but removes hop-by-hop headers.
         """
-        # Headers to exclude (hop-by-hop)
-        excluded = {
-            "host", "connection", "keep-alive", "proxy-authenticate",
-            "proxy-authorization", "te", "trailers", "transfer-encoding",
-            "upgrade", "content-length"
-        }
-        
         headers = {
-            key: value
-            for key, value in request.headers.items()
-            if key.lower() not in excluded
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in request.headers.raw
+            if name not in _EXCLUDED_REQUEST_HEADERS
         }
         
-        # Add X-Forwarded headers
-        headers["X-Forwarded-For"] = request.client.host if request.client else "unknown"
-        headers["X-Forwarded-Proto"] = request.url.scheme
-        headers["X-Forwarded-Host"] = request.headers.get("host", "")
+        # Add X-Forwarded headers; only the client address varies when the
+        # public scheme and host are configured
+        client = request.scope.get("client")
+        headers["X-Forwarded-For"] = client[0] if client else "unknown"
+        if not settings.PUBLIC_SCHEME:
+            headers["X-Forwarded-Proto"] = request.scope.get("scheme", "http")
+        if not settings.PUBLIC_HOST:
+            headers["X-Forwarded-Host"] = request.headers.get("host", "")
+        headers.update(_STATIC_FORWARDED_HEADERS)
         
         # Add extra headers
         if extra_headers:
@@ -97,6 +138,25 @@ class ProxyService:
         
         return headers
     
+    @staticmethod
+    def _stream_body(request: Request, headers: Dict[str, str]) -> Optional[AsyncIterator[bytes]]:
+        """
+        Forward the request body as a stream instead of buffering it.
+        
+        Keeps the client's Content-Length when present; a chunked request
+        body is re-sent chunked. Bodiless methods and requests carrying
+        neither header have no body, and receive() is never awaited.
+        """
+        if request.method in _BODILESS_METHODS:
+            return None
+        content_length = request.headers.get("content-length")
+        if content_length is not None:
+            headers["content-length"] = content_length
+            return request.stream()
+        if "transfer-encoding" in request.headers:
+            return request.stream()
+        return None
+    
     async def proxy_request(
         self,
         request: Request,
@@ -108,6 +168,8 @@ class ProxyService:
         """
         Proxy a request to a backend service.
 
+        Request and response bodies are streamed through without buffering.
+
         Args:
             request: FastAPI request
             service: Service name ("pdf" or "user")
@@ -118,78 +180,88 @@ class ProxyService:
         Returns:
             FastAPI Response
         """
-        service_url = self.get_service_url(service)
-        target_url = urljoin(service_url, path)
-
-        # Include query string
-        if request.url.query:
-            target_url = f"{target_url}?{request.url.query}"
-
-        logger.info(
-            "Proxying request",
-            method=request.method,
+        base_url = _SERVICE_BASE_URLS.get(service) or _SERVICE_BASE_URLS["pdf"]
+        target_url = base_url.copy_with(
             path=path,
-            service=service,
-            target=target_url
+            query=request.scope["query_string"] or None,
         )
 
+        # Per-request logs are debug-only; the guard skips building kwargs
+        debug = logger.is_enabled_for(logging.DEBUG)
+        if debug:
+            logger.debug(
+                "Proxying request",
+                method=request.method,
+                path=path,
+                service=service,
+                target=str(target_url)
+            )
+
         try:
-            # Use provided body or read from request
-            if body is None:
-                body = await request.body()
-            
             # Prepare headers
             headers = self._prepare_headers(request, extra_headers)
-            # When overriding body, drop Content-Length so it's set from actual content
-            if body is not None:
-                headers.pop("content-length", None)
             
-            # Make request
-            response = await self.client.request(
+            # Use provided body (Content-Length set from it) or stream the request body
+            content = body if body is not None else self._stream_body(request, headers)
+            
+            # Make request; the response body is streamed back, not buffered
+            req = self.client.build_request(
                 method=request.method,
                 url=target_url,
                 headers=headers,
-                content=body
+                content=content
+            )
+            # A streamed body can be read only once, so a 307/308 cannot be
+            # replayed; the redirect is passed through to the client instead
+            response = await self.client.send(
+                req,
+                stream=True,
+                follow_redirects=body is not None or content is None,
             )
             
-            # Prepare response headers
-            response_headers = dict(response.headers)
-            # Remove hop-by-hop headers from response
-            for header in ["transfer-encoding", "connection", "keep-alive"]:
-                response_headers.pop(header, None)
+            # Relay raw header pairs minus hop-by-hop ones; repeated headers
+            # such as Set-Cookie stay separate
+            response_headers = [
+                (key.lower(), value)
+                for key, value in response.headers.raw
+                if key.lower() not in _HOP_BY_HOP_BYTES
+            ]
             
-            logger.info(
-                "Proxy response",
-                status=response.status_code,
-                service=service,
-                path=path
-            )
+            if debug:
+                logger.debug(
+                    "Proxy response",
+                    status=response.status_code,
+                    service=service,
+                    path=path
+                )
             
-            return Response(
-                content=response.content,
+            # Raw bytes: Content-Encoding and Content-Length pass through as-is
+            proxied = StreamingResponse(
+                response.aiter_raw(),
                 status_code=response.status_code,
-                headers=response_headers,
-                media_type=response.headers.get("content-type")
+                background=BackgroundTask(response.aclose),
             )
+            proxied.raw_headers = response_headers
+            return proxied
             
         except httpx.ConnectError:
-            logger.error("Service unavailable", service=service, url=target_url)
+            logger.error("Service unavailable", service=service, url=str(target_url))
             return Response(
-                content='{"error": "Service Unavailable", "message": "Backend service is not responding"}',
+                content=_ERR_503,
                 status_code=503,
                 media_type="application/json"
             )
         except httpx.TimeoutException:
-            logger.error("Request timeout", service=service, url=target_url)
+            logger.error("Request timeout", service=service, url=str(target_url))
             return Response(
-                content='{"error": "Gateway Timeout", "message": "Backend service timed out"}',
+                content=_ERR_504,
                 status_code=504,
                 media_type="application/json"
             )
         except Exception as e:
             logger.error("Proxy error", service=service, error=str(e))
             return Response(
-                content=f'{{"error": "Gateway Error", "message": "{str(e)}"}}',
+                content=json.dumps({"error": "Gateway Error", "message": str(e)}),
                 status_code=502,
                 media_type="application/json"
             )
@@ -200,55 +272,14 @@ class ProxyService:
         service: str,
         path: str,
         extra_headers: Dict[str, str] = None
-    ) -> StreamingResponse:
+    ) -> Response:
         """
         Proxy a request with streaming response.
         
         Used for SSE, file downloads, and other streaming endpoints.
+        proxy_request streams every response, so this is kept as an alias.
         """
-        service_url = self.get_service_url(service)
-        target_url = urljoin(service_url, path)
-        
-        if request.url.query:
-            target_url = f"{target_url}?{request.url.query}"
-        
-        try:
-            body = await request.body()
-            headers = self._prepare_headers(request, extra_headers)
-            
-            # Use stream context
-            req = self.client.build_request(
-                method=request.method,
-                url=target_url,
-                headers=headers,
-                content=body
-            )
-            
-            response = await self.client.send(req, stream=True)
-            
-            async def stream_content():
-                try:
-                    async for chunk in response.aiter_bytes():
-                        yield chunk
-                finally:
-                    await response.aclose()
-            
-            return StreamingResponse(
-                stream_content(),
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.headers.get("content-type")
-            )
-            
-        except httpx.ConnectError:
-            async def error_stream():
-                yield b'{"error": "Service Unavailable"}'
-            return StreamingResponse(error_stream(), status_code=503)
-        except Exception as e:
-            logger.error("Streaming proxy error", error=str(e))
-            async def error_stream():
-                yield f'{{"error": "{str(e)}"}}'.encode()
-            return StreamingResponse(error_stream(), status_code=502)
+        return await self.proxy_request(request, service, path, extra_headers=extra_headers)
 
 
 # Singleton instance
@@ -39,32 +39,29 @@ async def proxy_auth(request: Request, path: str) -> Response:
     )
 
 
-# Explicit routes for OpenAPI documentation
-@router.post("/register", summary="Register new user", include_in_schema=True)
-async def register(request: Request) -> Response:
-    """Register a new user with email and password."""
-    return await proxy_service.proxy_request(request, "user", "/api/auth/register")
-
-
-@router.post("/login", summary="Login", include_in_schema=True)
-async def login(request: Request) -> Response:
-    """Login with email and password."""
-    return await proxy_service.proxy_request(request, "user", "/api/auth/login")
-
-
-@router.post("/logout", summary="Logout", include_in_schema=True)
-async def logout(request: Request) -> Response:
-    """Logout current user."""
-    return await proxy_service.proxy_request(request, "user", "/api/auth/logout")
+# Documented auth endpoints: (method, path, summary, description).
+# The catch-all above is registered first and serves these paths; the
+# entries below only surface them in the OpenAPI schema.
+_DOCUMENTED_ROUTES = (
+    ("POST", "/register", "Register new user", "Register a new user with email and password."),
+    ("POST", "/login", "Login", "Login with email and password."),
+    ("POST", "/logout", "Logout", "Logout current user."),
+    ("POST", "/refresh", "Refresh token", "Refresh access token."),
+    ("GET", "/me", "Get current user", "Get current authenticated user info."),
+)
 
 
-@router.post("/refresh", summary="Refresh token", include_in_schema=True)
-async def refresh(request: Request) -> Response:
-    """Refresh access token."""
-    return await proxy_service.proxy_request(request, "user", "/api/auth/refresh")
+async def _proxy_to_user_service(request: Request) -> Response:
+    """Forward the request to User-Service at the same path."""
+    return await proxy_service.proxy_request(request, "user", request.scope["path"])
 
 
-@router.get("/me", summary="Get current user", include_in_schema=True)
-async def me(request: Request) -> Response:
-    """Get current authenticated user info."""
-    return await proxy_service.proxy_request(request, "user", "/api/auth/me")
+for _method, _path, _summary, _description in _DOCUMENTED_ROUTES:
+    router.add_api_route(
+        _path,
+        _proxy_to_user_service,
+        methods=[_method],
+        summary=_summary,
+        description=_description,
+        operation_id=f"auth{_path.replace('/', '_')}",
+    )
@@ -2,24 +2,19 @@
 Chat and RAG routes - proxied to PDF Service.
 """
 
-from fastapi import APIRouter, Request, Response, Depends
+from fastapi import APIRouter, Request, Response
 
+from app import json
+from app.deps import get_auth_headers
 from app.proxy import proxy_service
-from app.middleware import auth_middleware
+from app.routes.factory import ProxyRoute, register_proxy_routes
 
 router = APIRouter(prefix="/api/chat", tags=["Chat"])
 
 
-async def get_auth_headers(request: Request) -> dict:
-    """Dependency to get auth headers."""
-    payload = await auth_middleware.authenticate(request)
-    return auth_middleware.get_user_headers(payload) if payload else {}
-
-
 @router.post("/{document_id}", summary="Ask question")
-async def ask_question(request: Request, document_id: str, auth_headers: dict = Depends(get_auth_headers)) -> Response:
+async def ask_question(request: Request, document_id: str) -> Response:
     """Ask a question about a document. Injects document_id into body for PDF service."""
-    import json
     body = await request.body()
     try:
         data = json.loads(body) if body else {}
@@ -28,28 +23,22 @@ async def ask_question(request: Request, document_id: str, auth_headers: dict =
     data["document_id"] = document_id
     return await proxy_service.proxy_request(
         request, "pdf", "/api/chat",
-        extra_headers=auth_headers,
-        body=json.dumps(data).encode("utf-8"),
+        extra_headers=get_auth_headers(request),
+        body=json.dumps(data),
     )
 
 
-@router.get("/{document_id}/stream", summary="Stream answer")
-async def stream_answer(request: Request, document_id: str, auth_headers: dict = Depends(get_auth_headers)) -> Response:
-    """Stream a response for a question (SSE)."""
-    return await proxy_service.proxy_streaming(
-        request, "pdf", f"/api/chat/{document_id}/stream",
-        extra_headers=auth_headers
-    )
-
-
-@router.api_route(
-    "/{path:path}",
-    methods=["GET", "POST"],
-    include_in_schema=False
-)
-async def proxy_chat(request: Request, path: str, auth_headers: dict = Depends(get_auth_headers)) -> Response:
-    """Proxy all other /api/chat/* requests."""
-    return await proxy_service.proxy_request(
-        request, "pdf", f"/api/chat/{path}",
-        extra_headers=auth_headers
-    )
+register_proxy_routes(router, [
+    ProxyRoute(
+        ["GET"], "/{document_id}/stream", "pdf", "/api/chat/{document_id}/stream",
+        name="stream_answer",
+        summary="Stream answer",
+        description="Stream a response for a question (SSE).",
+    ),
+    # All other /api/chat/* requests
+    ProxyRoute(
+        ["GET", "POST"], "/{path:path}", "pdf", "/api/chat/{path}",
+        name="proxy_chat",
+        include_in_schema=False,
+    ),
+])
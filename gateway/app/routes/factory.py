@@ -0,0 +1,86 @@
+"""
+Table-driven registration of pass-through proxy routes.
+"""
+
+import re
+from typing import Iterable, List, NamedTuple, Optional
+
+from fastapi import APIRouter, Request, Response
+
+from app.deps import get_auth_headers
+from app.proxy import proxy_service
+
+_PATH_PARAM_RE = re.compile(r"{(\w+)(?::\w+)?}")
+
+
+class ProxyRoute(NamedTuple):
+    """
+    A gateway route forwarded unchanged to a backend service.
+
+    target may reference the route's path parameters by name,
+    e.g. "/api/documents/{document_id}".
+    """
+    methods: List[str]
+    path: str
+    service: str
+    target: str
+    name: str
+    summary: Optional[str] = None
+    description: Optional[str] = None
+    include_in_schema: bool = True
+
+
+def _make_endpoint(service: str, target: str):
+    """Build the handler for one route; static targets skip formatting."""
+    if "{" not in target:
+        async def endpoint(request: Request) -> Response:
+            return await proxy_service.proxy_request(
+                request, service, target,
+                extra_headers=get_auth_headers(request)
+            )
+    else:
+        async def endpoint(request: Request) -> Response:
+            return await proxy_service.proxy_request(
+                request, service, target.format_map(request.path_params),
+                extra_headers=get_auth_headers(request)
+            )
+    return endpoint
+
+
+def register_proxy_routes(router: APIRouter, routes: Iterable[ProxyRoute]) -> None:
+    """
+    Add pass-through proxy routes to a router, in order.
+
+    Path parameters are not declared on the handler signature, so they are
+    documented through openapi_extra instead.
+
+    Args:
+        router: Router to register on
+        routes: Route table; catch-all entries should come last
+    """
+    for route in routes:
+        params = _PATH_PARAM_RE.findall(route.path)
+        openapi_extra = None
+        if params and route.include_in_schema:
+            openapi_extra = {
+                "parameters": [
+                    {
+                        "name": name,
+                        "in": "path",
+                        "required": True,
+                        "schema": {"type": "string", "title": name.replace("_", " ").title()},
+                    }
+                    for name in params
+                ]
+            }
+
+        router.add_api_route(
+            route.path,
+            _make_endpoint(route.service, route.target),
+            methods=route.methods,
+            name=route.name,
+            summary=route.summary,
+            description=route.description,
+            include_in_schema=route.include_in_schema,
+            openapi_extra=openapi_extra,
+        )
@@ -2,14 +2,32 @@
 WebSocket routes - proxied to backend services.
 """
 
-from fastapi import APIRouter, WebSocket, Query
+import re
 from typing import Optional
+from urllib.parse import unquote_plus
+
+from fastapi import APIRouter, WebSocket
 
 from app.websocket_proxy import websocket_proxy
 from app.middleware import auth_middleware
 
 router = APIRouter(tags=["WebSocket"])
 
+# Query-string token parameters, in priority order (token wins over access_token)
+_TOKEN_PARAM_RES = (
+    re.compile(rb"(?:^|&)token=([^&]+)"),
+    re.compile(rb"(?:^|&)access_token=([^&]+)"),
+)
+
+
+def _query_token(query_string: bytes) -> Optional[str]:
+    """Return the first non-empty token/access_token query value, if any."""
+    for pattern in _TOKEN_PARAM_RES:
+        match = pattern.search(query_string)
+        if match:
+            return unquote_plus(match.group(1).decode("latin-1"))
+    return None
+
 
 @router.websocket("/ws/chat/{document_id}")
 async def websocket_chat(websocket: WebSocket, document_id: str):
@@ -40,7 +58,8 @@ async def websocket_voice(websocket: WebSocket, document_id: str):
     await websocket_proxy.proxy_websocket(
         client_ws=websocket,
         service="pdf",
-        path=f"/ws/voice/{document_id}"
+        path=f"/ws/voice/{document_id}",
+        compression=None
     )
 
 
@@ -51,20 +70,24 @@ async def websocket_voice_realtime(websocket: WebSocket, document_id: str):
     
     Protocol:
     Client → Server:
-    - {"type": "audio_chunk", "data": "<base64>"}
+    - {"type": "audio_chunk", "data": "<base64>"} or binary 0x01 + raw audio
+    - {"type": "config", "binary_audio": true}
     - {"type": "end_speech"}
-    - {"type": "interrupt"}
+    - {"type": "interrupt"} or binary 0x02
     
     Server → Client:
     - {"type": "state_change", "state": "..."}
     - {"type": "transcription", "text": "..."}
-    - {"type": "audio_chunk", "data": "<base64>"}
+    - {"type": "audio_chunk", "data": "<base64>"} or, with binary_audio, raw binary audio
     - {"type": "audio_end"}
+    
+    Binary frames are forwarded untouched in both directions.
     """
     await websocket_proxy.proxy_websocket(
         client_ws=websocket,
         service="pdf",
-        path=f"/ws/voice/realtime/{document_id}"
+        path=f"/ws/voice/realtime/{document_id}",
+        compression=None
     )
 
 
@@ -85,9 +108,9 @@ async def websocket_voice_call(websocket: WebSocket, document_id: str):
     
     Protocol:
     Client → Server:
-    - {"type": "start_call"}
-    - {"type": "audio_chunk", "data": "<base64_pcm16>"}
-    - {"type": "interrupt"}
+    - {"type": "start_call", "binary_audio": true}
+    - {"type": "audio_chunk", "data": "<base64_pcm16>"} or binary 0x01 + raw PCM16
+    - {"type": "interrupt"} or binary 0x02
     - {"type": "mute"} / {"type": "unmute"}
     - {"type": "end_call"}
     
@@ -95,37 +118,31 @@ async def websocket_voice_call(websocket: WebSocket, document_id: str):
     - {"type": "call_started", "session_id": "...", "greeting": "..."}
     - {"type": "state_change", "state": "..."}
     - {"type": "transcription", "role": "...", "text": "..."}
-    - {"type": "audio_chunk", "data": "<base64_pcm16>"}
+    - {"type": "audio_chunk", "data": "<base64_pcm16>"} or, with binary_audio,
+      raw PCM16 binary frames (coalesced by the gateway)
     - {"type": "call_ended", "duration_seconds": ..., "questions_asked": ...}
     - {"type": "error", "message": "...", "code": "..."}
     """
     # Extract user info and forward to backend (required for voice call auth)
-    extra_headers = {}
+    token = None
     
     # 1. Prefer Authorization header (if client could send it)
     auth_header = websocket.headers.get("authorization")
-    
-    # 2. Fallback: token from query string (browsers cannot set headers on WebSocket)
-    if not auth_header:
-        query_string = (websocket.scope.get("query_string") or b"").decode()
-        if query_string:
-            from urllib.parse import parse_qs
-            params = parse_qs(query_string)
-            token_list = params.get("token") or params.get("access_token")
-            if token_list:
-                auth_header = f"Bearer {token_list[0]}"
-    
     if auth_header:
-        user_info = await auth_middleware.get_user_from_token(auth_header)
-        if user_info:
-            user_id = user_info.get("user_id", "").strip()
-            if user_id:
-                extra_headers["X-User-ID"] = user_id
-                extra_headers["X-User-Email"] = user_info.get("email", "") or ""
+        if auth_header.lower().startswith("bearer "):
+            token = auth_header[7:]
+    else:
+        # 2. Fallback: token from query string (browsers cannot set headers on WebSocket)
+        token = _query_token(websocket.scope.get("query_string") or b"")
+    
+    # Cached per token, so reconnects skip the decode
+    extra_headers = auth_middleware.get_ws_user_headers(token) if token else {}
     
     await websocket_proxy.proxy_websocket(
         client_ws=websocket,
         service="pdf",
         path=f"/ws/voice/call/{document_id}",
-        extra_headers=extra_headers
+        extra_headers=extra_headers,
+        compression=None,
+        coalesce_binary=True
     )
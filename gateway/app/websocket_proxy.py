@@ -3,19 +3,158 @@ WebSocket proxy for real-time communication.
 """
 
 import asyncio
-from typing import Optional
-from urllib.parse import urljoin, urlparse
+import inspect
+import logging
+import socket
+import ssl
+from types import MappingProxyType
+from typing import List, Mapping, Optional
+from urllib.parse import urlparse
 
 import websockets
 from fastapi import WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 
+from app import json
 from app.config import settings
 from app.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+def _ws_base_url(http_url: str) -> str:
+    """Convert an http(s) service URL to its ws(s)://netloc base."""
+    parsed = urlparse(http_url)
+    ws_scheme = "wss" if parsed.scheme == "https" else "ws"
+    return f"{ws_scheme}://{parsed.netloc}"
+
+
+# WebSocket base URL per service, parsed once at import
+_WS_BASE_URLS: Mapping[str, str] = MappingProxyType({
+    "pdf": _ws_base_url(settings.PDF_SERVICE_URL),
+    "user": _ws_base_url(settings.USER_SERVICE_URL),
+})
+
+# One TLS context shared by all wss:// backend connections. Without it,
+# every upgrade builds a default context and reloads the CA store.
+# Python's asyncio offers no client-side TLS session resumption, so this
+# is as much handshake work as can be reused.
+_SSL_CONTEXT: Optional[ssl.SSLContext] = (
+    ssl.create_default_context()
+    if any(url.startswith("wss://") for url in _WS_BASE_URLS.values())
+    else None
+)
+
+# websockets >= 14 takes additional_headers; the legacy client (12/13)
+# takes extra_headers. Resolved once instead of retrying on TypeError.
+_HEADERS_KWARG = (
+    "additional_headers"
+    if "additional_headers" in inspect.signature(websockets.connect).parameters
+    else "extra_headers"
+)
+
+# Call-control messages logged at info level. They are small JSON objects,
+# so larger frames (audio chunks) are never searched or parsed.
+_CALL_CONTROL_MARKERS = ('"start_call"', '"end_call"')
+_CONTROL_FRAME_MAX_LEN = 1024
+
+# Runs of binary audio frames from the backend are merged for at most this
+# long (seconds) or this many bytes before one send to the client
+_COALESCE_WINDOW = 0.005
+_COALESCE_MAX_BYTES = 32 * 1024
+
+
+def _message_type(data: str) -> Optional[str]:
+    """Parse a client frame just to read its "type" field (logging only)."""
+    try:
+        msg = json.loads(data)
+    except json.JSONDecodeError:
+        return None
+    return msg.get("type") if isinstance(msg, dict) else None
+
+
+def _set_nodelay(transport) -> None:
+    """
+    Ensure Nagle's algorithm is off for a TCP transport.
+
+    asyncio's and uvloop's TCP transports already set TCP_NODELAY; this
+    makes it explicit for small real-time audio frames regardless of loop.
+    """
+    sock = transport.get_extra_info("socket") if transport is not None else None
+    if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        pass
+
+
+async def _forward_coalesced(client_ws: WebSocket, backend_ws) -> None:
+    """
+    Forward backend frames to the client, merging runs of binary frames.
+
+    Binary frames (raw PCM16 audio) received within _COALESCE_WINDOW of the
+    first buffered one go out as a single frame of at most about
+    _COALESCE_MAX_BYTES. Text frames (control messages such as state_change
+    or transcription) flush the buffer and are sent straight away, so frame
+    order is preserved.
+    """
+    loop = asyncio.get_running_loop()
+    chunks: List[bytes] = []
+    size = 0
+    deadline = 0.0
+    # A recv() still pending when the window closed; it is kept rather
+    # than cancelled so no frame is lost
+    recv_task: Optional[asyncio.Future] = None
+
+    async def flush() -> None:
+        nonlocal size
+        data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+        chunks.clear()
+        size = 0
+        if client_ws.client_state == WebSocketState.CONNECTED:
+            await client_ws.send_bytes(data)
+
+    try:
+        while True:
+            if chunks:
+                if recv_task is None:
+                    recv_task = asyncio.ensure_future(backend_ws.recv())
+                done, _ = await asyncio.wait(
+                    {recv_task}, timeout=deadline - loop.time()
+                )
+                if not done:
+                    await flush()
+                    continue
+                message = recv_task.result()
+                recv_task = None
+            elif recv_task is not None:
+                message = await recv_task
+                recv_task = None
+            else:
+                message = await backend_ws.recv()
+
+            if isinstance(message, bytes):
+                if not chunks:
+                    deadline = loop.time() + _COALESCE_WINDOW
+                chunks.append(message)
+                size += len(message)
+                if size >= _COALESCE_MAX_BYTES:
+                    await flush()
+                continue
+
+            if chunks:
+                await flush()
+            if client_ws.client_state == WebSocketState.CONNECTED:
+                await client_ws.send_text(message)
+    except websockets.exceptions.ConnectionClosedOK:
+        if chunks:
+            await flush()
+    finally:
+        if recv_task is not None and not recv_task.done():
+            recv_task.cancel()
+
+
 class WebSocketProxy:
     """
     WebSocket proxy for forwarding WebSocket connections to backend services.
@@ -24,38 +163,44 @@ class WebSocketProxy:
     @staticmethod
     def get_ws_url(service: str, path: str) -> str:
         """Convert HTTP URL to WebSocket URL."""
-        if service == "pdf":
-            base_url = settings.PDF_SERVICE_URL
-        else:
-            base_url = settings.USER_SERVICE_URL
-        
-        # Convert http(s) to ws(s)
-        parsed = urlparse(base_url)
-        ws_scheme = "wss" if parsed.scheme == "https" else "ws"
-        ws_url = f"{ws_scheme}://{parsed.netloc}{path}"
-        
-        return ws_url
+        # Any service other than pdf goes to User-Service
+        return _WS_BASE_URLS["pdf" if service == "pdf" else "user"] + path
     
     @staticmethod
-    async def _proxy_messages(client_ws: WebSocket, backend_ws):
+    async def _proxy_messages(
+        client_ws: WebSocket,
+        backend_ws,
+        coalesce_binary: bool = False
+    ):
         """Helper method to proxy messages between client and backend."""
+        _set_nodelay(getattr(backend_ws, "transport", None))
+        
         # Create tasks for bidirectional forwarding
         async def forward_to_backend():
             """Forward messages from client to backend."""
+            # Checked once per connection rather than per frame
+            debug = logger.is_enabled_for(logging.DEBUG)
             try:
                 while True:
-                    data = await client_ws.receive_text()
-                    # Log start_call and end_call messages for debugging
-                    try:
-                        import json
-                        msg = json.loads(data)
-                        msg_type = msg.get("type")
+                    # Raw ASGI message: frames keep their opcode, binary
+                    # frames are never decoded
+                    message = await client_ws.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+                    data = message.get("text")
+                    if data is None:
+                        await backend_ws.send(message["bytes"])
+                        continue
+                    # Log start_call and end_call messages; other frames are
+                    # only parsed when debug logging is on
+                    if len(data) <= _CONTROL_FRAME_MAX_LEN and any(
+                        marker in data for marker in _CALL_CONTROL_MARKERS
+                    ):
+                        msg_type = _message_type(data)
                         if msg_type in ("start_call", "end_call"):
                             logger.info(f"Forwarding {msg_type} message to backend")
-                        else:
-                            logger.debug(f"Forwarding message type: {msg_type}")
-                    except Exception:
-                        pass
+                    elif debug:
+                        logger.debug(f"Forwarding message type: {_message_type(data)}")
                     await backend_ws.send(data)
             except WebSocketDisconnect:
                 logger.info("Client disconnected")
@@ -65,9 +210,16 @@ class WebSocketProxy:
         async def forward_to_client():
             """Forward messages from backend to client."""
             try:
+                if coalesce_binary:
+                    await _forward_coalesced(client_ws, backend_ws)
+                    return
                 async for message in backend_ws:
                     if client_ws.client_state == WebSocketState.CONNECTED:
-                        await client_ws.send_text(message)
+                        # websockets yields bytes for binary frames, str for text
+                        if isinstance(message, bytes):
+                            await client_ws.send_bytes(message)
+                        else:
+                            await client_ws.send_text(message)
             except Exception as e:
                 logger.error(f"Error forwarding to client: {e}")
         
@@ -78,19 +230,21 @@ class WebSocketProxy:
 
         try:
             done, pending = await asyncio.wait(
-                [task_to_backend, task_to_client],
+                {task_to_backend, task_to_client},
                 return_when=asyncio.FIRST_COMPLETED,
             )
-            # Cancel the still-running direction
+            # Cancel the still-running direction and wait for it to unwind
             for task in pending:
                 task.cancel()
-                try:
-                    await task
-                except (asyncio.CancelledError, Exception):
-                    pass
+            await asyncio.gather(*pending, return_exceptions=True)
         except Exception as e:
             logger.error(f"Error in proxy_messages: {e}")
         finally:
+            # Also reached on cancellation of this coroutine: stop both
+            # directions so neither outlives the proxy
+            for task in (task_to_backend, task_to_client):
+                if not task.done():
+                    task.cancel()
             # Always close the backend WebSocket when the proxy is done
             try:
                 await backend_ws.close()
@@ -103,7 +257,9 @@ class WebSocketProxy:
         client_ws: WebSocket,
         service: str,
         path: str,
-        extra_headers: dict = None
+        extra_headers: dict = None,
+        compression: Optional[str] = "deflate",
+        coalesce_binary: bool = False
     ):
         """
         Proxy WebSocket connection to backend service.
@@ -113,6 +269,10 @@ class WebSocketProxy:
             service: Backend service name
             path: WebSocket path on backend
             extra_headers: Additional headers (e.g., auth token)
+            compression: permessage-deflate offer to the backend ("deflate"),
+                or None to disable it (audio frames gain nothing from it)
+            coalesce_binary: Merge bursts of backend binary frames into
+                fewer client frames; only for raw PCM audio streams
         """
         target_url = WebSocketProxy.get_ws_url(service, path)
         
@@ -126,42 +286,39 @@ class WebSocketProxy:
         # Accept client connection
         await client_ws.accept()
         
-        # Prepare headers
-        headers = {}
-        if extra_headers:
-            headers.update(extra_headers)
-        
-        # Forward auth header if present
+        # Forward auth header if present. extra_headers may be a shared
+        # cached mapping, so it is passed as-is or copied, never mutated.
         auth_header = client_ws.headers.get("authorization")
         if auth_header:
+            headers = dict(extra_headers) if extra_headers else {}
             headers["Authorization"] = auth_header
+        else:
+            headers = extra_headers
         
         try:
             # Prepare connection kwargs
             connect_kwargs = {
                 "ping_interval": 20,
-                "ping_timeout": 10
+                "ping_timeout": 10,
+                "compression": compression,
+                # Bound per-connection buffering: frame size, frames queued
+                # for forward_to_client, and unsent bytes toward the backend
+                "max_size": 2**20,
+                "max_queue": 32,
+                "write_limit": 2**18,
             }
+            if target_url.startswith("wss://"):
+                connect_kwargs["ssl"] = _SSL_CONTEXT
             
-            # Add headers if provided (websockets 16 accepts dict or HeadersLike)
+            # Add headers if provided, under the installed client's kwarg name
             if headers:
-                connect_kwargs["additional_headers"] = headers
+                connect_kwargs[_HEADERS_KWARG] = headers
+            
+            async with websockets.connect(target_url, **connect_kwargs) as backend_ws:
+                await WebSocketProxy._proxy_messages(
+                    client_ws, backend_ws, coalesce_binary
+                )
             
-            # Connect - handle case where headers might not be supported
-            # TypeError occurs when entering the async context manager, not when creating it
-            try:
-                async with websockets.connect(target_url, **connect_kwargs) as backend_ws:
-                    await WebSocketProxy._proxy_messages(client_ws, backend_ws)
-            except TypeError as e:
-                # If headers caused the error, retry without them
-                if headers and ("additional_headers" in str(e) or "extra_headers" in str(e) or "unexpected keyword" in str(e)):
-                    logger.warning("WebSocket headers not supported, connecting without custom headers")
-                    connect_kwargs.pop("additional_headers", None)
-                    async with websockets.connect(target_url, **connect_kwargs) as backend_ws:
-                        await WebSocketProxy._proxy_messages(client_ws, backend_ws)
-                else:
-                    raise
-                
         except websockets.exceptions.InvalidStatusCode as e:
             logger.error(f"WebSocket connection rejected: {e}")
             if client_ws.client_state == WebSocketState.CONNECTED:
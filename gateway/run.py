@@ -4,11 +4,30 @@ Entry point for the API Gateway.
 Run with: python run.py
 """
 
+import importlib.util
+import os
+
 import uvicorn
 
 from app.config import settings
 
 
+def fast_server_options():
+    """Use uvloop and httptools when installed, else let uvicorn pick (e.g. on Windows)."""
+    return {
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "auto",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "auto",
+        "ws": "websockets",
+    }
+
+
+def worker_count() -> int:
+    """Workers to spawn: one under reload, else WORKERS or one per CPU."""
+    if settings.DEBUG:
+        return 1
+    return settings.WORKERS or os.cpu_count() or 1
+
+
 def main():
     """Run the API Gateway with uvicorn."""
     print(f"""
@@ -22,12 +41,18 @@ def main():
 ╚══════════════════════════════════════════════════════════════╝
     """)
     
+    server_options = fast_server_options()
+    workers = worker_count()
+    print(f"Event loop: {server_options['loop']}, HTTP parser: {server_options['http']}, workers: {workers}")
+    
     uvicorn.run(
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        workers=workers,
         log_level="debug" if settings.DEBUG else "info",
+        **server_options,
     )
 
 
@@ -0,0 +1,43 @@
+"""Tests for WebSocket user header resolution in the auth middleware."""
+
+import base64
+import json
+
+import pytest
+
+from app.middleware import AuthMiddleware
+
+
+def _unsigned_token(payload: dict) -> str:
+    """Build a JWT-shaped token; get_ws_user_headers does not verify it."""
+    def segment(obj: dict) -> str:
+        raw = json.dumps(obj).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    return f"{segment({'alg': 'HS256', 'typ': 'JWT'})}.{segment(payload)}.sig"
+
+
+def test_ws_headers_for_valid_subject():
+    token = _unsigned_token({"sub": " user-1 ", "email": "a@example.com"})
+    assert AuthMiddleware.get_ws_user_headers(token) == {
+        "X-User-ID": "user-1",
+        "X-User-Email": "a@example.com",
+    }
+
+
+@pytest.mark.parametrize("sub", [None, 123, ["user-1"], {"id": "user-1"}, "   "])
+def test_ws_headers_empty_for_null_or_non_string_subject(sub):
+    token = _unsigned_token({"sub": sub, "email": "a@example.com"})
+    assert AuthMiddleware.get_ws_user_headers(token) == {}
+
+
+def test_ws_headers_drop_non_string_email():
+    token = _unsigned_token({"sub": "user-2", "email": None})
+    assert AuthMiddleware.get_ws_user_headers(token) == {
+        "X-User-ID": "user-2",
+        "X-User-Email": "",
+    }
+
+
+def test_ws_headers_empty_for_malformed_token():
+    assert AuthMiddleware.get_ws_user_headers("not-a-jwt") == {}